@@ -18,6 +18,35 @@ class Settings(BaseSettings):
     # Google AI (Gemini) API
     google_ai_api_key: str = ""
 
+    # Chat session state (history/profile/memory)
+    # "memory" is per-process; "sqlite" is shared across uvicorn workers
+    session_backend: str = "memory"
+    session_sqlite_path: str = "sessions.db"
+    session_max_sessions: int = 5000
+    session_ttl_seconds: int = 3600
+    session_max_total_bytes: int = 64 * 1024 * 1024
+
+    # Chat session pool (live Gemini chat objects reused across turns)
+    chat_pool_max_sessions: int = 512
+    chat_pool_ttl_seconds: int = 1800
+
+    # Resource search result cache (entries, keyed by catalogue version; 0 disables)
+    resource_cache_max_entries: int = 1024
+    # Poll interval for edits to the resource catalogue file (0 disables the watcher)
+    resource_reload_interval_seconds: float = 5.0
+    # Build the semantic search model (NumPy/SciPy) with each catalogue load;
+    # when off, the first semantic search after a load builds it instead
+    resource_semantic_preload: bool = True
+
+    # Intent dataset hot reload
+    # Poll interval for dataset edits (0 disables the watcher)
+    intent_reload_interval_seconds: float = 5.0
+    # Shared secret for the admin reload endpoints (empty disables them)
+    admin_api_key: str = ""
+
+    # Crisis detection: phrases added to the built-in set (category "custom")
+    crisis_extra_phrases: list[str] = []
+
     # Unsplash API
     unsplash_access_key: str = ""
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 from fastapi import FastAPI
@@ -12,12 +13,17 @@ from .routers import (
     images_router,
     resources_router,
     playbooks_router,
+    intents_router,
     seasonal_router,
     profile_router,
     actions_router,
     feedback_router,
 )
-from .services.resource_service import init_resource_service
+from .services.resource_service import init_resource_service, watch_resource_catalogue
+from .services.crisis_bundle import init_crisis_bundle
+from .services.playbook_service import get_playbook_service
+from .services.intent_matcher import get_intent_matcher, watch_intent_dataset
+from .services.safety import get_safety_engine
 from .services.profile_service import profile_service
 from .services.feedback_service import feedback_service
 from .config import get_supabase_client
@@ -52,6 +58,7 @@ app.include_router(wellness_router, prefix="/api")
 app.include_router(images_router, prefix="/api")
 app.include_router(resources_router, prefix="/api")
 app.include_router(playbooks_router, prefix="/api")
+app.include_router(intents_router, prefix="/api")
 
 # Include new routers (Phases 3-6)
 app.include_router(seasonal_router)
@@ -67,9 +74,29 @@ async def startup_event():
     # Resolve path relative to project root
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     json_path = os.path.join(project_root, "data", "uvic_student_resources.json")
-    init_resource_service(json_path)
+    resource_service = init_resource_service(json_path)
     logger.info("Resource service initialized")
 
+    # Crisis payloads and playbook bundles embed resource cards, so build them
+    # once resources exist and again whenever the catalogue reloads
+    init_crisis_bundle()
+    get_playbook_service().init_resource_bundles()
+    resource_service.add_reload_listener(init_crisis_bundle)
+    resource_service.add_reload_listener(get_playbook_service().init_resource_bundles)
+    if settings.resource_reload_interval_seconds > 0:
+        app.state.resource_watcher = asyncio.create_task(
+            watch_resource_catalogue(resource_service, settings.resource_reload_interval_seconds)
+        )
+
+    # Build the intent index now so the first chat request doesn't pay for it
+    matcher = get_intent_matcher()
+    logger.info("Intent matcher initialized (dataset %s)", matcher.dataset_version)
+    if settings.intent_reload_interval_seconds > 0:
+        app.state.intent_watcher = asyncio.create_task(watch_intent_dataset(matcher, settings.intent_reload_interval_seconds))
+
+    # Compile the crisis detector before the first message arrives
+    get_safety_engine()
+
     try:
         supabase = get_supabase_client()
         profile_service.set_client(supabase)
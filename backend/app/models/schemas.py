@@ -1,10 +1,16 @@
 from pydantic import BaseModel, Field
 from enum import Enum
 from datetime import datetime
-from typing import Generic, TypeVar, Optional
+from typing import Annotated, Generic, TypeVar, Optional
 
 T = TypeVar("T")
 
+# Upper bounds on free text that is crisis-scanned and matched on the request path
+MAX_MESSAGE_LENGTH = 4000
+MAX_NOTE_LENGTH = 2000
+
+NoteText = Annotated[str, Field(max_length=MAX_NOTE_LENGTH)]
+
 
 # Chat models - Simplified for Mental Health & Wellness focus
 class ChatMode(str, Enum):
@@ -28,7 +34,7 @@ class CompanionMemory(BaseModel):
 
 class ChatMessageInput(BaseModel):
     """Input model for chat messages."""
-    message: str = Field(..., min_length=1, description="The user's message")
+    message: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH, description="The user's message")
     mode: ChatMode = ChatMode.WELLNESS
     session_id: Optional[str] = Field(None, description="Optional session ID for conversation continuity")
     profile: Optional[CompanionProfile] = Field(None, description="Optional user profile context")
@@ -69,7 +75,7 @@ class ResourceCardOut(BaseModel):
 
 class WellnessSuggestionRequest(BaseModel):
     mood: MoodLevel
-    note: Optional[str] = None
+    note: Optional[NoteText] = None
     weather: Optional[WeatherContext] = None
 
 
@@ -81,8 +87,8 @@ class WellnessSuggestionResponse(BaseModel):
 
 class WellnessChecklistRequest(BaseModel):
     mood: MoodLevel
-    note: Optional[str] = None
-    suggestions: Optional[list[str]] = None
+    note: Optional[NoteText] = None
+    suggestions: Optional[list[NoteText]] = Field(None, max_length=20)
     weather: Optional[WeatherContext] = None
     max_items: int = Field(5, ge=3, le=8)
 
@@ -94,9 +100,9 @@ class WellnessChecklistResponse(BaseModel):
 
 class WellnessCheckInRequest(BaseModel):
     mood: MoodLevel
-    note: Optional[str] = None
+    note: Optional[NoteText] = None
     weather: Optional[WeatherContext] = None
-    checklist_summary: Optional[str] = None
+    checklist_summary: Optional[NoteText] = None
 
 
 class WellnessCheckInResponse(BaseModel):
@@ -105,7 +111,7 @@ class WellnessCheckInResponse(BaseModel):
 
 class MoodEntryInput(BaseModel):
     mood: MoodLevel
-    note: Optional[str] = None
+    note: Optional[NoteText] = None
 
 
 class MoodEntry(BaseModel):
@@ -135,7 +141,9 @@ class PlaybookState(BaseModel):
 
 
 class PlaybookRunRequest(BaseModel):
-    message: str = Field(..., min_length=1, description="User message to route into a playbook")
+    message: str = Field(
+        ..., min_length=1, max_length=MAX_MESSAGE_LENGTH, description="User message to route into a playbook"
+    )
     state: Optional[PlaybookState] = None
 
 
@@ -149,3 +157,26 @@ class PlaybookRunResponse(BaseModel):
     resource_ids: list[str]
     resources: list[ResourceCardOut] = Field(default_factory=list)
     next_state: PlaybookState
+
+
+# Intent matching models
+class IntentMatchRequest(BaseModel):
+    message: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH, description="Message to classify")
+    top_k: int = Field(3, ge=1, le=20)
+    threshold: float = Field(0.0, ge=0.0, le=1.0)
+
+
+class IntentScore(BaseModel):
+    tag: str
+    score: float
+
+
+class IntentMatchResponse(BaseModel):
+    matches: list[IntentScore]
+    elapsed_ms: float
+    dataset_version: str
+
+
+class IntentReloadResponse(BaseModel):
+    reloaded: bool
+    dataset_version: str
@@ -4,6 +4,7 @@ from .auth import router as auth_router
 from .images import router as images_router
 from .resources import router as resources_router
 from .playbooks import router as playbooks_router
+from .intents import router as intents_router
 from .seasonal import router as seasonal_router
 from .profile import router as profile_router
 from .actions import router as actions_router
@@ -16,6 +17,7 @@ __all__ = [
     "images_router",
     "resources_router",
     "playbooks_router",
+    "intents_router",
     "seasonal_router",
     "profile_router",
     "actions_router",
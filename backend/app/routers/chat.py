@@ -1,4 +1,8 @@
+import asyncio
+import json
+from datetime import datetime
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from ..models.schemas import ChatMessageInput, ChatResponse, ApiResponse
 from ..services.chat_service import ChatService
@@ -6,6 +10,11 @@ from ..services.chat_service import ChatService
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("", response_model=ApiResponse[ChatResponse])
 async def send_message(body: ChatMessageInput) -> ApiResponse[ChatResponse]:
     """
@@ -13,7 +22,7 @@ async def send_message(body: ChatMessageInput) -> ApiResponse[ChatResponse]:
     
     Powered by Google Gemini 3.0 Flash Preview.
     """
-    response = ChatService.get_contextual_response(
+    response = await ChatService.get_contextual_response_async(
         message=body.message, 
         mode=body.mode,
         session_id=body.session_id,
@@ -23,6 +32,36 @@ async def send_message(body: ChatMessageInput) -> ApiResponse[ChatResponse]:
     return ApiResponse(success=True, data=response)
 
 
+@router.post("/stream")
+async def stream_message(body: ChatMessageInput) -> StreamingResponse:
+    """
+    Stream a response as Server-Sent Events.
+
+    Emits a `token` event (`{"delta": "..."}`) per generated chunk, then a
+    single `done` event carrying the full ChatResponse.
+    """
+    async def event_stream():
+        parts: list[str] = []
+        async for delta in ChatService.stream_contextual_response(
+            message=body.message,
+            mode=body.mode,
+            session_id=body.session_id,
+            profile=body.profile,
+            memory=body.memory,
+        ):
+            parts.append(delta)
+            yield _sse_event("token", {"delta": delta})
+
+        final = ChatResponse(message="".join(parts), timestamp=datetime.utcnow())
+        yield _sse_event("done", final.model_dump(mode="json"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/exercise/{exercise_type}", response_model=ApiResponse[str])
 async def get_exercise(exercise_type: str = "breathing") -> ApiResponse[str]:
     """
@@ -34,8 +73,14 @@ async def get_exercise(exercise_type: str = "breathing") -> ApiResponse[str]:
     return ApiResponse(success=True, data=exercise)
 
 
+@router.get("/stats", response_model=ApiResponse[dict])
+async def get_chat_stats() -> ApiResponse[dict]:
+    """Get chat pool hit-rate and session statistics."""
+    return ApiResponse(success=True, data=await asyncio.to_thread(ChatService.get_stats))
+
+
 @router.delete("/session/{session_id}", response_model=ApiResponse[bool])
 async def clear_session(session_id: str) -> ApiResponse[bool]:
     """Clear conversation history for a session."""
-    result = ChatService.clear_session(session_id)
+    result = await asyncio.to_thread(ChatService.clear_session, session_id)
     return ApiResponse(success=True, data=result)
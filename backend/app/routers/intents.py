@@ -0,0 +1,67 @@
+"""
+Router for intent matching against the mental health conversations dataset.
+"""
+
+import asyncio
+import secrets
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+
+from ..config import settings
+from ..models.schemas import (
+    ApiResponse,
+    IntentMatchRequest,
+    IntentMatchResponse,
+    IntentReloadResponse,
+    IntentScore,
+)
+from ..services.intent_matcher import get_intent_matcher
+
+router = APIRouter(prefix="/intents", tags=["intents"])
+
+
+@router.post("/match", response_model=ApiResponse[IntentMatchResponse])
+async def match_intents(body: IntentMatchRequest) -> ApiResponse[IntentMatchResponse]:
+    """
+    Rank the top-k intents for a message.
+
+    Scores use the same scale as the single-match confidence (0.0 to 1.0).
+    `elapsed_ms` is the server-side matching time for this request.
+    """
+    matcher = get_intent_matcher()
+    start = time.perf_counter()
+    ranking = matcher.rank_intents(body.message, k=body.top_k, threshold=body.threshold)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return ApiResponse(
+        success=True,
+        data=IntentMatchResponse(
+            matches=[IntentScore(tag=tag, score=score) for tag, score in ranking.matches],
+            elapsed_ms=round(elapsed_ms, 3),
+            dataset_version=ranking.dataset_version,
+        ),
+    )
+
+
+@router.post("/reload", response_model=ApiResponse[IntentReloadResponse])
+async def reload_intents(
+    force: bool = False,
+    x_admin_key: Optional[str] = Header(None),
+) -> ApiResponse[IntentReloadResponse]:
+    """
+    Rebuild the intent index from the dataset file (admin).
+
+    Requires the `X-Admin-Key` header to match ADMIN_API_KEY. The new index is
+    built off the event loop and swapped in once ready.
+    """
+    if not settings.admin_api_key or not secrets.compare_digest(x_admin_key or "", settings.admin_api_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin key required")
+
+    matcher = get_intent_matcher()
+    reloaded = await asyncio.to_thread(matcher.reload, force)
+    return ApiResponse(
+        success=True,
+        data=IntentReloadResponse(reloaded=reloaded, dataset_version=matcher.dataset_version),
+    )
@@ -2,16 +2,18 @@
 Router for structured wellness playbooks.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from ..models.schemas import ApiResponse, PlaybookRunRequest, PlaybookRunResponse
+from ..services.crisis_bundle import get_crisis_bundle
+from ..services.message_analysis import analyze_message
 from ..services.playbook_service import get_playbook_service
 
 router = APIRouter(prefix="/playbooks", tags=["playbooks"])
 
 
 @router.post("/run", response_model=ApiResponse[PlaybookRunResponse])
-async def run_playbook(body: PlaybookRunRequest) -> ApiResponse[PlaybookRunResponse]:
+async def run_playbook(body: PlaybookRunRequest) -> ApiResponse[PlaybookRunResponse] | Response:
     """
     Run a structured playbook flow.
 
@@ -20,7 +22,12 @@ async def run_playbook(body: PlaybookRunRequest) -> ApiResponse[PlaybookRunRespo
     - triage question
     - action plan/checklist
     - suggested UVic resource IDs
+
+    Crisis messages get the precomputed crisis payload, sent as-is.
     """
+    if analyze_message(body.message).is_crisis:
+        return Response(content=get_crisis_bundle().playbook_json, media_type="application/json")
+
     service = get_playbook_service()
-    response = service.run(message=body.message, state=body.state)
+    response = await service.run(message=body.message, state=body.state)
     return ApiResponse(success=True, data=response)
@@ -2,13 +2,16 @@
 Router for UVic student resources search.
 """
 
+import asyncio
 import logging
+import secrets
 from typing import Optional
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query, status
 from pydantic import BaseModel
 
+from ..config import settings
 from ..models.schemas import ApiResponse
-from ..services.resource_service import get_resource_service
+from ..services.resource_service import ResourceSearchMode, get_resource_service
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +32,58 @@ class ResourceSearchData(BaseModel):
     """Resource search result data."""
     query: str
     results: list[ResourceCard]
+    # Changes whenever the catalogue reloads; clients can key caches on it
+    catalogue_version: str
+
+
+class ResourceCategoryCount(BaseModel):
+    """A category and how many resources it holds."""
+    name: str
+    count: int
+
+
+class ResourceCategoriesData(BaseModel):
+    """Category facets for browsing."""
+    categories: list[ResourceCategoryCount]
+    catalogue_version: str
+
+
+class ResourceCategoryPage(BaseModel):
+    """One page of a category's resources, ordered by name."""
+    category: str
+    total: int
+    offset: int
+    limit: int
+    results: list[ResourceCard]
+    catalogue_version: str
+
+
+class ResourceSuggestionOut(BaseModel):
+    """One typeahead suggestion."""
+    text: str
+    kind: str
+    resource_id: Optional[str] = None
+    count: int
+
+
+class ResourceSuggestData(BaseModel):
+    """Typeahead suggestions for a prefix."""
+    prefix: str
+    suggestions: list[ResourceSuggestionOut]
+    catalogue_version: str
+
+
+class ResourceReloadData(BaseModel):
+    """Result of an admin catalogue reload."""
+    reloaded: bool
+    catalogue_version: str
 
 
 @router.get("/search", response_model=ApiResponse[ResourceSearchData])
 async def search_resources(
     q: Optional[str] = Query(None, description="Search query string"),
+    mode: ResourceSearchMode = Query(ResourceSearchMode.SUBSTRING, description="Ranking mode"),
+    category: Optional[str] = Query(None, description="Only return resources in this category"),
 ) -> ApiResponse[ResourceSearchData]:
     """
     Search UVic student resources.
@@ -45,6 +95,17 @@ async def search_resources(
     - location match = +1 point
     
     Results sorted by score descending, then name ascending.
+
+    `mode=bm25` instead ranks by BM25 over every query word (same field
+    weights, with synonyms such as counseling/counselling), so multi-word
+    queries match resources that contain only some of the words.
+    `mode=semantic` ranks by character n-gram TF-IDF similarity, which
+    tolerates misspellings and handles free text such as "i need someone
+    to talk to".
+
+    `category` (case-insensitive, see /resources/categories) limits results
+    to one category. `catalogue_version` identifies the catalogue the
+    results came from.
     """
     service = get_resource_service()
 
@@ -59,7 +120,7 @@ async def search_resources(
 
     # Perform search
     query_str = q or ""
-    results = service.search(query_str)
+    results, catalogue_version = service.search(query_str, mode=mode, category=category)
 
     # Convert to ResourceCard models
     resource_cards = [ResourceCard(**r) for r in results]
@@ -69,5 +130,116 @@ async def search_resources(
         data=ResourceSearchData(
             query=query_str,
             results=resource_cards,
+            catalogue_version=catalogue_version,
         ),
     )
+
+
+@router.get("/categories", response_model=ApiResponse[ResourceCategoriesData])
+async def list_resource_categories() -> ApiResponse[ResourceCategoriesData]:
+    """Every resource category with its resource count, largest first."""
+    service = get_resource_service()
+    if not service.is_loaded:
+        return ApiResponse(success=False, error=service.load_error or "Resources not loaded")
+
+    counts, catalogue_version = service.category_counts()
+    return ApiResponse(
+        success=True,
+        data=ResourceCategoriesData(
+            categories=[ResourceCategoryCount(name=name, count=count) for name, count in counts],
+            catalogue_version=catalogue_version,
+        ),
+    )
+
+
+@router.get("/categories/{category}", response_model=ApiResponse[ResourceCategoryPage])
+async def list_category_resources(
+    category: str,
+    offset: int = Query(0, ge=0, description="Resources to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+) -> ApiResponse[ResourceCategoryPage]:
+    """
+    Page through one category's resources (case-insensitive name).
+
+    Resources are ordered by name, so pages stay stable for a given
+    `catalogue_version`. Unknown categories return an empty page.
+    """
+    service = get_resource_service()
+    if not service.is_loaded:
+        return ApiResponse(success=False, error=service.load_error or "Resources not loaded")
+
+    total, results, catalogue_version = service.list_category(category, offset=offset, limit=limit)
+    return ApiResponse(
+        success=True,
+        data=ResourceCategoryPage(
+            category=category,
+            total=total,
+            offset=offset,
+            limit=limit,
+            results=[ResourceCard(**result) for result in results],
+            catalogue_version=catalogue_version,
+        ),
+    )
+
+
+@router.get("/suggest", response_model=ApiResponse[ResourceSuggestData])
+async def suggest_resources(
+    prefix: str = Query("", description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum suggestions"),
+) -> ApiResponse[ResourceSuggestData]:
+    """
+    Typeahead suggestions for the resource picker.
+
+    Matches resource names, categories and locations that have a word
+    starting with `prefix` (case-insensitive), e.g. "couns" suggests
+    "UVic Counselling". Name suggestions carry the resource id.
+    """
+    service = get_resource_service()
+    if not service.is_loaded:
+        return ApiResponse(success=False, error=service.load_error or "Resources not loaded")
+
+    suggestions, catalogue_version = service.suggest(prefix, limit=limit)
+    return ApiResponse(
+        success=True,
+        data=ResourceSuggestData(
+            prefix=prefix,
+            suggestions=[
+                ResourceSuggestionOut(
+                    text=suggestion.text,
+                    kind=suggestion.kind,
+                    resource_id=suggestion.resource_id,
+                    count=suggestion.count,
+                )
+                for suggestion in suggestions
+            ],
+            catalogue_version=catalogue_version,
+        ),
+    )
+
+
+@router.get("/stats", response_model=ApiResponse[dict])
+async def get_resource_stats() -> ApiResponse[dict]:
+    """Search result cache statistics (hits, misses, size, catalogue version)."""
+    return ApiResponse(success=True, data=get_resource_service().cache_stats())
+
+
+@router.post("/reload", response_model=ApiResponse[ResourceReloadData])
+async def reload_resources(
+    force: bool = False,
+    x_admin_key: Optional[str] = Header(None),
+) -> ApiResponse[ResourceReloadData]:
+    """
+    Reload the resource catalogue from its JSON file (admin).
+
+    Requires the `X-Admin-Key` header to match ADMIN_API_KEY. The new
+    catalogue is built off the event loop and swapped in once ready.
+    """
+    if not settings.admin_api_key or not secrets.compare_digest(x_admin_key or "", settings.admin_api_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin key required")
+
+    service = get_resource_service()
+    reloaded = await asyncio.to_thread(service.reload, force)
+    return ApiResponse(
+        success=True,
+        data=ResourceReloadData(reloaded=reloaded, catalogue_version=service.version),
+    )
@@ -1,5 +1,5 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from supabase import Client
 from ..models.schemas import (
     MoodEntryInput,
@@ -12,7 +12,8 @@ from ..models.schemas import (
     WellnessCheckInRequest,
     WellnessCheckInResponse,
 )
-from ..services.wellness_service import WellnessService
+from ..services.wellness_service import WellnessService, contains_crisis
+from ..services.crisis_bundle import get_crisis_bundle
 from ..auth.dependencies import get_current_user, TokenData
 from ..config import get_supabase_client
 
@@ -30,6 +31,11 @@ def get_wellness_service() -> WellnessService:
         raise HTTPException(status_code=500, detail="Service temporarily unavailable")
 
 
+def _crisis_json(body: bytes) -> Response:
+    """Send a precomputed crisis payload without re-validating it."""
+    return Response(content=body, media_type="application/json")
+
+
 def get_wellness_service_relaxed() -> WellnessService:
     """
     Return a WellnessService even if Supabase is not configured.
@@ -97,8 +103,10 @@ async def get_mood_stats(
 async def get_suggestions(
     body: WellnessSuggestionRequest,
     service: WellnessService = Depends(get_wellness_service_relaxed),
-) -> ApiResponse[WellnessSuggestionResponse]:
+) -> ApiResponse[WellnessSuggestionResponse] | Response:
     """Generate Lantern suggestions based on mood, note, and weather."""
+    if contains_crisis(body.note):
+        return _crisis_json(get_crisis_bundle().wellness_suggestions_json)
     try:
         suggestions = await service.generate_suggestions(
             mood=body.mood,
@@ -115,8 +123,10 @@ async def get_suggestions(
 async def create_checklist(
     body: WellnessChecklistRequest,
     service: WellnessService = Depends(get_wellness_service_relaxed),
-) -> ApiResponse[WellnessChecklistResponse]:
+) -> ApiResponse[WellnessChecklistResponse] | Response:
     """Generate a checklist based on mood, note, suggestions, and weather."""
+    if contains_crisis(body.note, " ".join(body.suggestions or [])):
+        return _crisis_json(get_crisis_bundle().wellness_checklist_json)
     try:
         checklist = await service.generate_checklist(
             mood=body.mood,
@@ -135,8 +145,10 @@ async def create_checklist(
 async def generate_checkin(
     body: WellnessCheckInRequest,
     service: WellnessService = Depends(get_wellness_service_relaxed),
-) -> ApiResponse[WellnessCheckInResponse]:
+) -> ApiResponse[WellnessCheckInResponse] | Response:
     """Generate a follow-up check-in after checklist completion."""
+    if contains_crisis(body.note, body.checklist_summary):
+        return _crisis_json(get_crisis_bundle().wellness_checkin_json)
     try:
         message = await service.generate_checkin(
             mood=body.mood,
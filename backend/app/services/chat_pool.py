@@ -0,0 +1,89 @@
+"""
+Chat session pool.
+
+Keeps live Gemini chat sessions between turns so repeat messages in a
+session skip model construction and history marshalling.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def hash_system_prompt(prompt: str) -> str:
+    """Stable short hash used to detect system-prompt changes."""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+
+class ChatSessionPool:
+    """
+    LRU/TTL pool of chat sessions keyed by session ID.
+
+    Each entry carries a fingerprint (system-prompt hash plus the session's
+    history revision); a pooled chat is only reused when it still matches.
+
+    Sessions are checked out with `acquire` and handed back with `release`,
+    so two concurrent turns never share one chat object.
+    """
+
+    def __init__(self, max_sessions: int = 512, ttl_seconds: float = 1800):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[str, Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def acquire(self, session_id: str, fingerprint: str) -> Optional[Any]:
+        """Check out a pooled chat, or return None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                self._misses += 1
+                return None
+            entry_fingerprint, chat, last_used = entry
+            if entry_fingerprint != fingerprint or now - last_used > self.ttl_seconds:
+                self._evictions += 1
+                self._misses += 1
+                return None
+            self._hits += 1
+            return chat
+
+    def release(self, session_id: str, fingerprint: str, chat: Any) -> None:
+        """Return a chat to the pool after a successful turn."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[session_id] = (fingerprint, chat, now)
+            self._entries.move_to_end(session_id)
+            self._evict_locked(now)
+
+    def discard(self, session_id: str) -> None:
+        """Drop any pooled chat for a session."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def _evict_locked(self, now: float) -> None:
+        # Oldest entries sit at the front, so expired ones are found first.
+        while self._entries:
+            session_id, (_, _, last_used) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_sessions and now - last_used <= self.ttl_seconds:
+                break
+            del self._entries[session_id]
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        """Pool size and hit-rate counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_sessions": self.max_sessions,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
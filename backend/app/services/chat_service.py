@@ -3,16 +3,21 @@ Chat Service - Lantern Companion Experience
 Powered by Google Gemini 3 Flash Preview
 """
 
+import asyncio
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Optional
 import google.generativeai as genai
 from ..config import settings
 from ..models.schemas import ChatMode, ChatResponse, CompanionProfile, CompanionMemory
+from .chat_pool import ChatSessionPool, hash_system_prompt
+from .session_store import SessionState, create_session_store
 from .safety import (
-    detect_crisis,
+    StreamingSafetyScanner,
     build_crisis_response,
     build_crisis_resources_block,
+    screen_reply,
 )
+from .message_analysis import analyze_message
 
 # Configure Google Gemini
 genai.configure(api_key=settings.google_ai_api_key)
@@ -20,6 +25,9 @@ genai.configure(api_key=settings.google_ai_api_key)
 # Model name for Gemini 3 Flash Preview
 GEMINI_MODEL_NAME = "gemini-3-flash-preview"
 
+# Number of history entries (user + model turns) sent with each message
+HISTORY_WINDOW = 10
+
 _CRISIS_RESOURCES_BLOCK = build_crisis_resources_block()
 
 SYSTEM_PROMPT = f"""You are Lantern 🏮 — a warm, best-friend companion for UVic students.
@@ -116,34 +124,40 @@ PROHIBITED ACTIONS (“THE SHADOW ZONE”)
 class ChatService:
     """Service for handling companion chat interactions using Gemini 3.0 Flash."""
     
-    # Store conversation history for context (in production, use proper session management)
-    _conversation_history: dict[str, List[dict]] = {}
-    _session_profiles: dict[str, dict] = {}
-    _session_memories: dict[str, dict] = {}
+    _chat_pool = ChatSessionPool(
+        max_sessions=settings.chat_pool_max_sessions,
+        ttl_seconds=settings.chat_pool_ttl_seconds,
+    )
+    # Conversation history, profile and memory per session (bounded LRU/TTL)
+    _sessions = create_session_store(
+        settings.session_backend,
+        sqlite_path=settings.session_sqlite_path,
+        max_sessions=settings.session_max_sessions,
+        ttl_seconds=settings.session_ttl_seconds,
+        max_total_bytes=settings.session_max_total_bytes,
+        on_evict=_chat_pool.discard,
+    )
 
     @classmethod
-    def _merge_profile(cls, session_id: Optional[str], profile_data: Optional[dict]) -> dict:
-        if not profile_data and session_id:
-            return cls._session_profiles.get(session_id, {})
+    def _merge_session_field(cls, session_id: Optional[str], field_name: str, data: Optional[dict]) -> dict:
         if not session_id:
-            return profile_data or {}
-        existing = cls._session_profiles.get(session_id, {})
-        if profile_data:
-            existing.update({k: v for k, v in profile_data.items() if v})
-        cls._session_profiles[session_id] = existing
+            return data or {}
+        state = cls._sessions.get(session_id)
+        if not data:
+            return getattr(state, field_name) if state else {}
+        state = state or SessionState()
+        existing = getattr(state, field_name)
+        existing.update({k: v for k, v in data.items() if v})
+        cls._sessions.save(session_id, state)
         return existing
 
+    @classmethod
+    def _merge_profile(cls, session_id: Optional[str], profile_data: Optional[dict]) -> dict:
+        return cls._merge_session_field(session_id, "profile", profile_data)
+
     @classmethod
     def _merge_memory(cls, session_id: Optional[str], memory_data: Optional[dict]) -> dict:
-        if not memory_data and session_id:
-            return cls._session_memories.get(session_id, {})
-        if not session_id:
-            return memory_data or {}
-        existing = cls._session_memories.get(session_id, {})
-        if memory_data:
-            existing.update({k: v for k, v in memory_data.items() if v})
-        cls._session_memories[session_id] = existing
-        return existing
+        return cls._merge_session_field(session_id, "memory", memory_data)
 
     @classmethod
     def _build_system_prompt(cls, profile: dict, memory: dict, base_prompt: Optional[str] = None) -> str:
@@ -185,6 +199,149 @@ class ChatService:
             "Let's try again in a moment."
         )
     
+    @staticmethod
+    def _generation_config() -> genai.types.GenerationConfig:
+        return genai.types.GenerationConfig(
+            max_output_tokens=1024,
+            temperature=0.7,
+            top_p=0.9,
+            top_k=40,
+        )
+
+    @classmethod
+    def _prepare_turn(
+        cls,
+        message: str,
+        session_id: Optional[str],
+        profile: Optional[CompanionProfile],
+        memory: Optional[CompanionMemory],
+        system_prompt_override: Optional[str],
+    ) -> tuple[Optional[ChatResponse], Optional[genai.ChatSession], str, StreamingSafetyScanner]:
+        """
+        Resolve session context for one turn.
+
+        Returns either an immediate response (crisis or missing API key) or
+        a chat session primed with history and ready to send the message,
+        along with the system-prompt hash it was pooled under and the
+        output scanner for the reply.
+        """
+        profile_data = profile.dict(exclude_none=True) if profile else None
+        memory_data = memory.dict(exclude_none=True) if memory else None
+        merged_profile = cls._merge_profile(session_id, profile_data)
+        merged_memory = cls._merge_memory(session_id, memory_data)
+
+        preferred_name = merged_profile.get("preferred_name") if merged_profile else None
+        state = cls._sessions.get(session_id) if session_id else None
+        if analyze_message(message).is_crisis:
+            if session_id:
+                state = state or SessionState()
+                state.crisis_followup = True
+                cls._sessions.save(session_id, state)
+            return ChatResponse(
+                message=build_crisis_response(preferred_name),
+                timestamp=datetime.utcnow(),
+            ), None, "", StreamingSafetyScanner()
+
+        scanner = StreamingSafetyScanner(
+            require_crisis_resources=bool(state and state.crisis_followup),
+            preferred_name=preferred_name,
+        )
+        if not settings.google_ai_api_key:
+            return ChatResponse(
+                message=cls._fallback_message(system_prompt_override == CASUAL_SYSTEM_PROMPT),
+                timestamp=datetime.utcnow(),
+            ), None, "", scanner
+
+        system_prompt = cls._build_system_prompt(
+            merged_profile,
+            merged_memory,
+            base_prompt=system_prompt_override,
+        )
+        prompt_hash = hash_system_prompt(system_prompt)
+
+        # Reuse the live chat for this session when neither the prompt nor
+        # the stored history (possibly written by another worker) has changed
+        if session_id:
+            revision = state.revision if state else 0
+            pooled_chat = cls._chat_pool.acquire(session_id, f"{prompt_hash}:{revision}")
+            if pooled_chat is not None:
+                return None, pooled_chat, prompt_hash, scanner
+
+        # Build conversation context
+        history = []
+        if state:
+            history = state.history[-HISTORY_WINDOW:]
+
+        # Create the model with system instruction
+        chat_model = genai.GenerativeModel(
+            model_name=GEMINI_MODEL_NAME,
+            system_instruction=system_prompt,
+        )
+
+        # Start or continue chat
+        return None, chat_model.start_chat(history=history), prompt_hash, scanner
+
+    @classmethod
+    def _complete_turn(
+        cls,
+        session_id: Optional[str],
+        prompt_hash: str,
+        chat: genai.ChatSession,
+        message: str,
+        response_text: str,
+    ) -> None:
+        """Record a completed exchange and return the chat to the pool."""
+        state = cls._record_exchange(session_id, message, response_text)
+        if state is None:
+            return
+
+        # Keep the pooled chat on the same window a rebuilt one would get
+        chat_history = chat.history
+        if len(chat_history) > HISTORY_WINDOW:
+            chat.history = chat_history[-HISTORY_WINDOW:]
+        cls._chat_pool.release(session_id, f"{prompt_hash}:{state.revision}", chat)
+
+    @classmethod
+    def _finish_reply(
+        cls,
+        session_id: Optional[str],
+        prompt_hash: str,
+        chat: genai.ChatSession,
+        message: str,
+        reply_text: str,
+        scanner: StreamingSafetyScanner,
+    ) -> str:
+        """Screen a complete reply, record it, and return the text to send."""
+        screened = screen_reply(reply_text, scanner.require_crisis_resources, scanner.preferred_name)
+        if screened == reply_text:
+            cls._complete_turn(session_id, prompt_hash, chat, message, screened)
+        else:
+            # The chat's own history holds the unscreened reply; let it be rebuilt
+            cls._record_exchange(session_id, message, screened)
+        return screened
+
+    @classmethod
+    def _record_exchange(cls, session_id: Optional[str], message: str, response_text: str) -> Optional[SessionState]:
+        """Append an exchange to the session history (None without a session)."""
+        if not session_id:
+            return None
+        state = cls._sessions.get(session_id) or SessionState()
+        state.history.append({
+            "role": "user",
+            "parts": [message]
+        })
+        state.history.append({
+            "role": "model",
+            "parts": [response_text]
+        })
+        # Limit history size
+        if len(state.history) > 20:
+            state.history = state.history[-20:]
+        state.revision += 1
+        state.crisis_followup = False
+        cls._sessions.save(session_id, state)
+        return state
+
     @classmethod
     def get_contextual_response(
         cls, 
@@ -197,6 +354,9 @@ class ChatService:
     ) -> ChatResponse:
         """
         Generate a companion-focused response using Google Gemini 3.0 Flash.
+
+        Blocks the calling thread for the full Gemini round trip; request
+        handlers should use `get_contextual_response_async` instead.
         
         Args:
             message: The user's message
@@ -208,71 +368,15 @@ class ChatService:
         """
         
         try:
-            # Build conversation context
-            history = []
-            if session_id and session_id in cls._conversation_history:
-                history = cls._conversation_history[session_id][-10:]  # Keep last 10 exchanges
-
-            profile_data = profile.dict(exclude_none=True) if profile else None
-            memory_data = memory.dict(exclude_none=True) if memory else None
-            merged_profile = cls._merge_profile(session_id, profile_data)
-            merged_memory = cls._merge_memory(session_id, memory_data)
-
-            if detect_crisis(message):
-                preferred_name = merged_profile.get("preferred_name") if merged_profile else None
-                return ChatResponse(
-                    message=build_crisis_response(preferred_name),
-                    timestamp=datetime.utcnow(),
-                )
-
-            is_casual_prompt = system_prompt_override == CASUAL_SYSTEM_PROMPT
-            if not settings.google_ai_api_key:
-                return ChatResponse(
-                    message=cls._fallback_message(is_casual_prompt),
-                    timestamp=datetime.utcnow(),
-                )
-            
-            # Create the model with system instruction
-            chat_model = genai.GenerativeModel(
-                model_name=GEMINI_MODEL_NAME,
-                system_instruction=cls._build_system_prompt(
-                    merged_profile,
-                    merged_memory,
-                    base_prompt=system_prompt_override,
-                ),
+            early_response, chat, prompt_hash, scanner = cls._prepare_turn(
+                message, session_id, profile, memory, system_prompt_override
             )
-            
-            # Start or continue chat
-            chat = chat_model.start_chat(history=history)
-            
+            if early_response:
+                return early_response
+
             # Generate response
-            response = chat.send_message(
-                message,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=1024,
-                    temperature=0.7,
-                    top_p=0.9,
-                    top_k=40,
-                )
-            )
-            
-            response_text = response.text
-            
-            # Update conversation history
-            if session_id:
-                if session_id not in cls._conversation_history:
-                    cls._conversation_history[session_id] = []
-                cls._conversation_history[session_id].append({
-                    "role": "user",
-                    "parts": [message]
-                })
-                cls._conversation_history[session_id].append({
-                    "role": "model", 
-                    "parts": [response_text]
-                })
-                # Limit history size
-                if len(cls._conversation_history[session_id]) > 20:
-                    cls._conversation_history[session_id] = cls._conversation_history[session_id][-20:]
+            response = chat.send_message(message, generation_config=cls._generation_config())
+            response_text = cls._finish_reply(session_id, prompt_hash, chat, message, response.text, scanner)
             
         except Exception as e:
             # Fallback response if API fails
@@ -283,22 +387,140 @@ class ChatService:
             message=response_text,
             timestamp=datetime.utcnow()
         )
+
+    @classmethod
+    async def get_contextual_response_async(
+        cls,
+        message: str,
+        mode: ChatMode,
+        session_id: Optional[str] = None,
+        profile: Optional[CompanionProfile] = None,
+        memory: Optional[CompanionMemory] = None,
+        system_prompt_override: Optional[str] = None,
+    ) -> ChatResponse:
+        """
+        Non-blocking variant of `get_contextual_response`.
+
+        Uses the SDK's async client so a slow Gemini round trip yields the
+        event loop instead of stalling every other request on the worker.
+        Session store reads and writes (disk I/O with the SQLite backend)
+        run in a worker thread for the same reason.
+        """
+        try:
+            early_response, chat, prompt_hash, scanner = await asyncio.to_thread(
+                cls._prepare_turn, message, session_id, profile, memory, system_prompt_override
+            )
+            if early_response:
+                return early_response
+
+            response = await chat.send_message_async(message, generation_config=cls._generation_config())
+            response_text = await asyncio.to_thread(
+                cls._finish_reply, session_id, prompt_hash, chat, message, response.text, scanner
+            )
+
+        except Exception as e:
+            # Fallback response if API fails
+            print(f"Gemini API error: {e}")
+            response_text = cls._fallback_message(system_prompt_override == CASUAL_SYSTEM_PROMPT)
+
+        return ChatResponse(
+            message=response_text,
+            timestamp=datetime.utcnow()
+        )
     
+    @classmethod
+    async def stream_contextual_response(
+        cls,
+        message: str,
+        mode: ChatMode,
+        session_id: Optional[str] = None,
+        profile: Optional[CompanionProfile] = None,
+        memory: Optional[CompanionMemory] = None,
+        system_prompt_override: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield reply text chunks as Gemini generates them.
+
+        Crisis and no-API-key replies are yielded as a single chunk. Output
+        passes through a StreamingSafetyScanner, which holds back a short
+        tail and cuts over to a safe reply if the model states medication
+        doses. The session history is only updated once the stream has
+        completed.
+        """
+        is_casual_prompt = system_prompt_override == CASUAL_SYSTEM_PROMPT
+        try:
+            early_response, chat, prompt_hash, scanner = await asyncio.to_thread(
+                cls._prepare_turn, message, session_id, profile, memory, system_prompt_override
+            )
+        except Exception as e:
+            print(f"Gemini API error: {e}")
+            yield cls._fallback_message(is_casual_prompt)
+            return
+
+        if early_response:
+            yield early_response.message
+            return
+
+        chunks: list[str] = []
+        raw_chunks: list[str] = []
+        try:
+            response = await chat.send_message_async(
+                message,
+                generation_config=cls._generation_config(),
+                stream=True,
+            )
+            async for chunk in response:
+                text = chunk.text if chunk.parts else ""
+                if not text:
+                    continue
+                raw_chunks.append(text)
+                released = scanner.feed(text)
+                if scanner.violation:
+                    break
+                if released:
+                    chunks.append(released)
+                    yield released
+        except Exception as e:
+            print(f"Gemini API error: {e}")
+            if not chunks:
+                yield cls._fallback_message(is_casual_prompt)
+            elif not scanner.violation:
+                yield scanner.finish()
+            return
+
+        if scanner.violation:
+            # Stop relaying the model; its chat no longer matches what was sent
+            print(f"Gemini reply flagged ({scanner.violation.category}), cutting over")
+            cutover = ("\n\n" if chunks else "") + scanner.cutover_text()
+            yield cutover
+            await asyncio.to_thread(cls._record_exchange, session_id, message, "".join(chunks) + cutover)
+            return
+
+        tail = scanner.finish()
+        if tail:
+            chunks.append(tail)
+            yield tail
+        reply_text = "".join(chunks)
+        if reply_text == "".join(raw_chunks):
+            await asyncio.to_thread(cls._complete_turn, session_id, prompt_hash, chat, message, reply_text)
+        else:
+            # Crisis resources were appended; the chat's own history lacks them
+            await asyncio.to_thread(cls._record_exchange, session_id, message, reply_text)
+
     @classmethod
     def clear_session(cls, session_id: str) -> bool:
         """Clear conversation history for a session."""
-        cleared = False
-        if session_id in cls._conversation_history:
-            del cls._conversation_history[session_id]
-            cleared = True
-        if session_id in cls._session_profiles:
-            del cls._session_profiles[session_id]
-            cleared = True
-        if session_id in cls._session_memories:
-            del cls._session_memories[session_id]
-            cleared = True
-        return cleared
+        cls._chat_pool.discard(session_id)
+        return cls._sessions.delete(session_id)
     
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Runtime statistics for session state and the chat pool."""
+        return {
+            "sessions": cls._sessions.stats(),
+            "chat_pool": cls._chat_pool.stats(),
+        }
+
     @classmethod
     def get_quick_exercise(cls, exercise_type: str = "breathing") -> str:
         """
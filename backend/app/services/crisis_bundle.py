@@ -0,0 +1,121 @@
+"""
+Precomputed crisis responses.
+
+Crisis replies never depend on the message beyond the fact that it is a
+crisis, so the playbook and wellness payloads (resource cards included) are
+built once at startup, after resources load. Each payload is kept both as a
+response model and as its serialized `ApiResponse` envelope, which routers
+send as-is. The crisis path then skips resource searches, model building
+and response validation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from ..models.schemas import (
+    ApiResponse,
+    PlaybookRunResponse,
+    PlaybookStage,
+    PlaybookState,
+    ResourceCardOut,
+    WellnessCheckInResponse,
+    WellnessChecklistResponse,
+    WellnessSuggestionResponse,
+)
+from .resource_service import get_resource_service
+from .safety import (
+    build_crisis_checkin_message,
+    build_crisis_follow_up_question,
+    build_crisis_response,
+    get_crisis_action_steps,
+    get_crisis_resource_lines,
+)
+
+# Tight, safety-focused resource set (avoid unrelated clinics)
+CRISIS_RESOURCE_QUERIES = [
+    "UVic Counselling",
+    "Student Wellness Centre",
+    "Student Wellness",
+]
+
+
+@dataclass(frozen=True)
+class CrisisBundle:
+    playbook: PlaybookRunResponse
+    wellness_suggestions: WellnessSuggestionResponse
+    wellness_checklist: WellnessChecklistResponse
+    wellness_checkin: WellnessCheckInResponse
+    # Serialized ApiResponse envelopes for the payloads above
+    playbook_json: bytes
+    wellness_suggestions_json: bytes
+    wellness_checklist_json: bytes
+    wellness_checkin_json: bytes
+
+
+def _collect_crisis_resources(max_resources: int) -> list[ResourceCardOut]:
+    # Exclude unrelated clinics/services (e.g., sexual health).
+    return get_resource_service().search_many(
+        CRISIS_RESOURCE_QUERIES,
+        per_query_limit=3,
+        total_limit=max_resources,
+        exclude=lambda resource: "sexual health" in resource.name_lower,
+    )
+
+
+def _envelope(payload) -> bytes:
+    return ApiResponse[type(payload)](success=True, data=payload).model_dump_json().encode("utf-8")
+
+
+def build_crisis_bundle() -> CrisisBundle:
+    # Imported lazily: playbook_service uses this module
+    from .playbook_service import MAX_ACTIONS, MAX_RESOURCES
+
+    support_items = get_crisis_action_steps() + get_crisis_resource_lines()
+    resources = _collect_crisis_resources(MAX_RESOURCES)
+
+    playbook = PlaybookRunResponse(
+        playbook_id="crisis",
+        stage=PlaybookStage.PLAN,
+        validation=build_crisis_response(),
+        triage_question=None,
+        action_title="Immediate support steps",
+        actions=support_items[:MAX_ACTIONS],
+        resource_ids=[resource.id for resource in resources],
+        resources=resources,
+        next_state=PlaybookState(playbook_id="crisis", stage=PlaybookStage.PLAN),
+    )
+    suggestions = WellnessSuggestionResponse(
+        suggestions=support_items[:5],
+        follow_up_question=build_crisis_follow_up_question(),
+        resources=[],
+    )
+    checklist = WellnessChecklistResponse(title="Immediate support steps", items=support_items[:6])
+    checkin = WellnessCheckInResponse(message=build_crisis_checkin_message())
+
+    return CrisisBundle(
+        playbook=playbook,
+        wellness_suggestions=suggestions,
+        wellness_checklist=checklist,
+        wellness_checkin=checkin,
+        playbook_json=_envelope(playbook),
+        wellness_suggestions_json=_envelope(suggestions),
+        wellness_checklist_json=_envelope(checklist),
+        wellness_checkin_json=_envelope(checkin),
+    )
+
+
+_crisis_bundle: Optional[CrisisBundle] = None
+
+
+def init_crisis_bundle() -> CrisisBundle:
+    """(Re)build the bundle; call once resources have loaded."""
+    global _crisis_bundle
+    _crisis_bundle = build_crisis_bundle()
+    return _crisis_bundle
+
+
+def get_crisis_bundle() -> CrisisBundle:
+    """Get the crisis bundle, building it on first use if startup did not."""
+    return _crisis_bundle or init_crisis_bundle()
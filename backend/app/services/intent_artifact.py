@@ -0,0 +1,100 @@
+"""
+Precompiled intent dataset artifact.
+
+`compile_intent_artifact` pickles a built `IntentIndex` (normalized
+patterns, token sets, posting lists) together with the SHA-256 of the JSON
+it came from. `load_intent_artifact` returns the index only when the
+artifact's format version and source hash still match, so a stale artifact
+falls back to parsing the JSON.
+
+The artifact is a local build product loaded with pickle; only load files
+this service wrote itself.
+
+Usage (from backend/):
+    python -m app.services.intent_artifact
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from .intent_matcher import DATASET_PATH, DATASET_VERSION_LENGTH, INDEX_FORMAT_VERSION, IntentIndex
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_path_for(dataset_path: Path) -> Path:
+    """Default artifact location next to the dataset JSON."""
+    return dataset_path.with_suffix(".index.pkl")
+
+
+def source_digest(dataset_path: Path) -> str:
+    with open(dataset_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_intent_artifact(
+    index: IntentIndex,
+    dataset_path: Path,
+    artifact_path: Optional[Path] = None,
+    digest: Optional[str] = None,
+) -> Path:
+    """Write `index` as a versioned artifact, atomically replacing any old one."""
+    artifact_path = artifact_path or artifact_path_for(dataset_path)
+    digest = digest or source_digest(dataset_path)
+    index.version = digest[:DATASET_VERSION_LENGTH]
+    payload = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "source_sha256": digest,
+        "index": index,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=artifact_path.parent, prefix=artifact_path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return artifact_path
+
+
+def load_intent_artifact(
+    dataset_path: Path,
+    artifact_path: Optional[Path] = None,
+    digest: Optional[str] = None,
+) -> Optional[IntentIndex]:
+    """Return the precompiled index, or None if missing, unreadable or stale."""
+    artifact_path = artifact_path or artifact_path_for(dataset_path)
+    if not artifact_path.exists():
+        return None
+    try:
+        with open(artifact_path, "rb") as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        logger.warning("Failed to read intent artifact %s: %s", artifact_path, e)
+        return None
+
+    if payload.get("format_version") != INDEX_FORMAT_VERSION:
+        logger.info("Intent artifact %s has an old format, recompiling", artifact_path)
+        return None
+    if payload.get("source_sha256") != (digest or source_digest(dataset_path)):
+        logger.info("Intent artifact %s is stale, recompiling", artifact_path)
+        return None
+    return payload.get("index")
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    with open(DATASET_PATH, "r", encoding="utf-8") as f:
+        intents = json.load(f).get("intents", [])
+    path = compile_intent_artifact(IntentIndex(intents), DATASET_PATH)
+    print(f"Compiled {len(intents)} intents to {path} in {(time.perf_counter() - start) * 1000:.1f} ms")
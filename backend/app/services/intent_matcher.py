@@ -1,79 +1,430 @@
+import asyncio
+import heapq
 import json
 import logging
 import random
 import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from .keyword_automaton import KeywordAutomaton
+from .typo_index import TrigramIndex
+
+if TYPE_CHECKING:
+    from .intent_vectorizer import IntentVectorModel
 
 logger = logging.getLogger(__name__)
 
+DATASET_PATH = Path(__file__).parent.parent.parent.parent / "data" / "mental_health_conversations.json"
+
+# Boost score for keyword matches in important tags.
+# Only boost if critical keywords from the tag itself are present.
+CRITICAL_KEYWORDS: dict[str, list[str]] = {
+    # Crisis & Safety
+    "suicide": ["kill", "suicide", "die", "death", "end my life", "want to die", "better off dead"],
+    "self-harm": ["hurt myself", "self harm", "cut myself", "cutting", "harming myself"],
+
+    # Core Mental Health
+    "depressed": ["depressed", "depression", "no interest", "feel dead inside"],
+    "sad": ["sad", "lonely", "empty", "down", "crying", "hopeless", "broken", "forgotten"],
+    "anxious": ["anxious", "anxiety", "worried", "panic", "nervous", "racing", "on edge"],
+    "stressed": ["stressed", "stress", "burned", "burnout", "overwhelmed", "pressure", "drowning"],
+    "worthless": ["worthless", "useless", "nothing", "failure", "not good enough", "pathetic", "loser"],
+    "scared": ["scared", "afraid", "fear", "terrified", "frightened", "unsafe"],
+
+    # Emotional States
+    "anger": ["angry", "furious", "rage", "pissed", "mad", "irritated", "frustrated", "hate everything"],
+    "overwhelmed": ["overwhelmed", "too much", "can't handle", "drowning", "breaking", "falling apart"],
+    "panic-attack": ["panic attack", "can't breathe", "heart racing", "panicking", "freaking out"],
+
+    # Life Challenges
+    "relationship-issues": ["relationship", "partner", "boyfriend", "girlfriend", "spouse", "fighting"],
+    "breakup": ["breakup", "broke up", "ex", "dumped", "heartbroken", "ended"],
+    "family-issues": ["family", "parents", "toxic", "controlling", "don't understand"],
+    "work-stress": ["job", "work", "boss", "coworkers", "overworked", "quit", "career"],
+    "school-stress": ["school", "exams", "grades", "failing", "academic", "college", "university"],
+
+    # Self-Image & Behavior
+    "body-image": ["body", "ugly", "fat", "skinny", "appearance", "looks", "attractive"],
+    "eating-issues": ["eating", "food", "binge", "restrict", "eating disorder", "skip meals"],
+    "confidence": ["confidence", "insecure", "self esteem", "inferior", "doubt myself"],
+    "motivation": ["motivation", "unmotivated", "no energy", "can't start", "pointless"],
+
+    # Trauma & Addiction
+    "trauma": ["trauma", "ptsd", "abused", "flashbacks", "haunted", "assaulted"],
+    "addiction": ["addiction", "addicted", "can't stop", "alcohol", "drugs", "relapsing"],
+
+    # Support Seeking
+    "coping-strategies": ["cope", "coping", "strategies", "manage", "deal with"],
+    "grounding": ["grounding", "disconnected", "dissociating", "not real", "floaty"],
+    "breathing": ["breathing", "breathe", "calm down"],
+    "affirmation": ["encouragement", "positive", "affirmation", "validation", "hope"],
+    "self-care": ["self care", "self-care", "take care", "relax", "destress"],
+
+    # Sleep
+    "sleep": ["sleep", "insomnia", "can't sleep", "nightmares", "exhausted"],
+
+    # Positive States
+    "happy": ["happy", "great", "good", "wonderful", "amazing", "joyful", "grateful"],
+    "achievement": ["accomplished", "proud", "achieved", "succeeded", "did it", "finished"],
+
+    # Social
+    "friends": ["friends", "friendless", "no friends", "lonely"],
+    "helping-others": ["help someone", "friend is struggling", "worried about"]
+}
+
+# High boost for crisis/emotional keywords to override false containment matches
+CRISIS_TAGS = {"suicide", "self-harm", "panic-attack"}
+CRISIS_BOOST = 0.95
+EMOTIONAL_BOOST = 0.92
+
+# Every critical keyword compiled into one automaton, tagged with its intent tag
+_CRITICAL_KEYWORD_AUTOMATON: KeywordAutomaton[str] = KeywordAutomaton(
+    (keyword, tag) for tag, keywords in CRITICAL_KEYWORDS.items() for keyword in keywords
+)
+
+# Bump whenever IntentIndex's stored layout changes (invalidates compiled artifacts)
+INDEX_FORMAT_VERSION = 5
+
+# Length of the source-digest prefix reported as the dataset version
+DATASET_VERSION_LENGTH = 12
+
+# Minimum pattern length for substring containment matches
+MIN_CONTAINMENT_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class IntentRanking:
+    matches: list[tuple[str, float]]
+    dataset_version: str
+
+
+def _stat_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def critical_keyword_boosts(normalized_input: str) -> dict[str, float]:
+    """Every tag whose critical keywords appear in the input, with its boost."""
+    return {
+        tag: CRISIS_BOOST if tag in CRISIS_TAGS else EMOTIONAL_BOOST
+        for tag in _CRITICAL_KEYWORD_AUTOMATON.payloads(normalized_input)
+    }
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for better pattern matching."""
+    # Convert to lowercase and strip whitespace
+    text = text.lower().strip()
+    # Remove punctuation except apostrophes
+    text = re.sub(r"[^\w\s']", "", text)
+    return text
+
+
+class IntentIndex:
+    """
+    Immutable search index over the intents dataset.
+
+    Patterns are normalized and tokenized once. A token -> pattern posting
+    list finds word-overlap candidates, and a 3-character prefix table finds
+    patterns contained as substrings of the input, so scoring only touches
+    patterns that can score above zero.
+    """
+
+    def __init__(self, intents: list[dict]):
+        self.intents = intents
+        # Per scored pattern: (intent position, order, normalized text, token set)
+        self.patterns: list[tuple[int, int, str, frozenset[str]]] = []
+        # Order of the first pattern of each scorable intent (boost target)
+        self.intent_first_order: dict[int, int] = {}
+        self.postings: dict[str, list[int]] = {}
+        self.prefixes: dict[str, list[int]] = {}
+        self.tag_positions: dict[str, list[int]] = {}
+
+        order = 0
+        for position, intent in enumerate(intents):
+            tag = intent.get("tag", "")
+            self.tag_positions.setdefault(tag, []).append(position)
+            patterns = intent.get("patterns", [])
+            if not patterns or not intent.get("responses", []):
+                continue
+            self.intent_first_order[position] = order
+            for pattern in patterns:
+                normalized = normalize_text(pattern)
+                tokens = frozenset(normalized.split())
+                if normalized and not normalized.isspace() and tokens:
+                    pattern_id = len(self.patterns)
+                    self.patterns.append((position, order, normalized, tokens))
+                    for token in tokens:
+                        self.postings.setdefault(token, []).append(pattern_id)
+                    if len(normalized) >= MIN_CONTAINMENT_LENGTH:
+                        self.prefixes.setdefault(normalized[:MIN_CONTAINMENT_LENGTH], []).append(pattern_id)
+                order += 1
+
+        # Vocabulary for typo correction: pattern words plus critical keywords.
+        # A correction never produces a one-word crisis keyword ("fill" must
+        # not become "kill")
+        self.typo_index = TrigramIndex(
+            [token for _, _, _, tokens in self.patterns for token in tokens]
+            + [word for keywords in CRITICAL_KEYWORDS.values() for keyword in keywords for word in keyword.split()],
+            protected=[keyword for tag in CRISIS_TAGS for keyword in CRITICAL_KEYWORDS.get(tag, ()) if " " not in keyword],
+        )
+
+        # Set by the loader (source digest prefix); reported with every match
+        self.version = ""
+        self._vector_model: Optional["IntentVectorModel"] = None
+
+    def __getstate__(self) -> dict:
+        # The TF-IDF model is derived data; rebuild it lazily after unpickling
+        state = self.__dict__.copy()
+        state["_vector_model"] = None
+        return state
+
+    def vector_model(self) -> "IntentVectorModel":
+        """TF-IDF model over this index, built on first use (needs NumPy/SciPy)."""
+        if self._vector_model is None:
+            from .intent_vectorizer import IntentVectorModel
+
+            self._vector_model = IntentVectorModel(self)
+        return self._vector_model
+
+    def candidates(self, normalized_input: str, user_words: set[str]) -> set[int]:
+        """Pattern IDs that share a token with, or are contained in, the input."""
+        candidate_ids: set[int] = set()
+        for word in user_words:
+            candidate_ids.update(self.postings.get(word, ()))
+        for start in range(len(normalized_input) - MIN_CONTAINMENT_LENGTH + 1):
+            bucket = self.prefixes.get(normalized_input[start:start + MIN_CONTAINMENT_LENGTH])
+            if not bucket:
+                continue
+            for pattern_id in bucket:
+                if normalized_input.startswith(self.patterns[pattern_id][2], start):
+                    candidate_ids.add(pattern_id)
+        return candidate_ids
+
+
+def score_pattern(normalized_input: str, user_words: set[str], normalized_pattern: str, pattern_words: frozenset[str]) -> float:
+    """Similarity between a normalized input and a pre-normalized pattern."""
+    # Check for exact match first
+    if normalized_input == normalized_pattern:
+        return 1.0
+
+    # Check if pattern is contained in user input (only for non-trivial patterns)
+    if len(normalized_pattern) >= MIN_CONTAINMENT_LENGTH and normalized_pattern in normalized_input:
+        return 0.9
+
+    # Calculate word overlap (Jaccard-like similarity)
+    intersection = user_words & pattern_words
+    union = user_words | pattern_words
+
+    if not union:
+        return 0.0
+
+    return len(intersection) / len(union)
+
 
 class IntentMatcher:
     """Pattern-based intent matcher using the mental health conversations dataset."""
 
-    def __init__(self):
-        self.intents = []
-        self._load_dataset()
-
-    def _load_dataset(self):
-        """Load the mental health conversations dataset."""
-        dataset_path = Path(__file__).parent.parent.parent.parent / "data" / "mental_health_conversations.json"
+    def __init__(self, intents: Optional[list[dict]] = None):
+        self._reload_lock = threading.Lock()
+        self._dataset_stat: Optional[tuple[int, int]] = None
+        if intents is None:
+            self._index = self._load_index()
+        else:
+            self._index = IntentIndex(intents)
+            self._index.version = "inline"
+
+    @property
+    def intents(self) -> list[dict]:
+        return self._index.intents
+
+    @property
+    def dataset_version(self) -> str:
+        """Version (source digest prefix) of the index currently serving matches."""
+        return self._index.version
+
+    def _load_index(self) -> IntentIndex:
+        """Load the precompiled index, rebuilding it from JSON when stale."""
+        from .intent_artifact import load_intent_artifact, source_digest
+
+        digest = None
+        if DATASET_PATH.exists():
+            self._dataset_stat = _stat_signature(DATASET_PATH)
+            digest = source_digest(DATASET_PATH)
+            index = load_intent_artifact(DATASET_PATH, digest=digest)
+            if index is not None:
+                return index
+
+        return self._build_index(self._load_dataset(), digest)
+
+    def _build_index(self, intents: Optional[list[dict]], digest: Optional[str]) -> IntentIndex:
+        """Index already parsed intents and save them as the artifact for `digest`."""
+        from .intent_artifact import compile_intent_artifact
+
+        index = IntentIndex(intents or [])
+        index.version = digest[:DATASET_VERSION_LENGTH] if digest else "empty"
+        if digest and intents:
+            try:
+                compile_intent_artifact(index, DATASET_PATH, digest=digest)
+            except OSError as e:
+                logger.warning("Could not write intent artifact: %s", e)
+        return index
+
+    def _load_dataset(self) -> Optional[list[dict]]:
+        """Load the mental health conversations dataset (None if unreadable)."""
+        dataset_path = DATASET_PATH
 
         try:
             with open(dataset_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                self.intents = data.get("intents", [])
+                return data.get("intents", [])
         except FileNotFoundError:
             logger.warning("Dataset not found at %s", dataset_path)
-            self.intents = []
+            return None
         except json.JSONDecodeError as e:
             logger.warning("Failed to parse dataset: %s", e)
-            self.intents = []
+            return None
+
+    def dataset_changed(self) -> bool:
+        """Cheap check (size + mtime) for edits to the dataset file."""
+        return DATASET_PATH.exists() and _stat_signature(DATASET_PATH) != self._dataset_stat
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the index from the dataset and swap it in atomically.
+
+        Matches already in flight keep the index they started with. A
+        dataset that fails to parse (e.g. mid-write) leaves the current index
+        serving. Returns True if a new index was swapped in.
+        """
+        from .intent_artifact import load_intent_artifact, source_digest
+
+        with self._reload_lock:
+            if not DATASET_PATH.exists():
+                return False
+            dataset_stat = _stat_signature(DATASET_PATH)
+            digest = source_digest(DATASET_PATH)
+            if not force and digest[:DATASET_VERSION_LENGTH] == self._index.version:
+                self._dataset_stat = dataset_stat
+                return False
+
+            # An artifact is only compiled from JSON that parsed, so a current
+            # one needs no parse check; otherwise the JSON is parsed once
+            index = load_intent_artifact(DATASET_PATH, digest=digest)
+            if index is None:
+                intents = self._load_dataset()
+                if intents is None:
+                    return False
+                index = self._build_index(intents, digest)
+            self._dataset_stat = dataset_stat
+
+            previous_version = self._index.version
+            # Single reference assignment: readers see the old or new index, never a mix
+            self._index = index
+            logger.info("Intent dataset reloaded: %s -> %s", previous_version, index.version)
+            return True
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for better pattern matching."""
-        # Convert to lowercase and strip whitespace
-        text = text.lower().strip()
-        # Remove punctuation except apostrophes
-        text = re.sub(r"[^\w\s']", "", text)
-        return text
+        return normalize_text(text)
 
     def _calculate_similarity(self, user_input: str, pattern: str) -> float:
         """Calculate similarity between user input and a pattern."""
-        normalized_pattern = self._normalize_text(pattern)
-        normalized_input = self._normalize_text(user_input)
+        normalized_pattern = normalize_text(pattern)
+        normalized_input = normalize_text(user_input)
 
         # Skip empty or whitespace-only patterns
         if not normalized_pattern or normalized_pattern.isspace():
             return 0.0
 
-        user_words = set(normalized_input.split())
-        pattern_words = set(normalized_pattern.split())
-
+        pattern_words = frozenset(normalized_pattern.split())
         if not pattern_words:
             return 0.0
 
-        # Check for exact match first
-        if normalized_input == normalized_pattern:
-            return 1.0
-
-        # Check if pattern is contained in user input (only for non-trivial patterns)
-        if len(normalized_pattern) >= 3 and normalized_pattern in normalized_input:
-            return 0.9
+        return score_pattern(normalized_input, set(normalized_input.split()), normalized_pattern, pattern_words)
 
-        # Calculate word overlap (Jaccard-like similarity)
-        intersection = user_words & pattern_words
-        union = user_words | pattern_words
+    def _boosted_intents(self, index: IntentIndex, normalized_input: str, crisis: bool = True) -> dict[int, float]:
+        """Keyword boost per intent position, computed once per message (crisis tags optional)."""
+        boosts: dict[int, float] = {}
+        for tag, boost_score in critical_keyword_boosts(normalized_input).items():
+            if not crisis and tag in CRISIS_TAGS:
+                continue
+            for position in index.tag_positions.get(tag, ()):
+                if position in index.intent_first_order:
+                    boosts[position] = boost_score
+        return boosts
+
+    def _score_intents(
+        self,
+        index: IntentIndex,
+        normalized_input: str,
+        boosts: Optional[dict[int, float]] = None,
+    ) -> dict[int, tuple[float, int]]:
+        """
+        Best score per intent position in a single pass over candidates.
 
-        if not union:
-            return 0.0
+        Each value is (score, order of the first pattern reaching it), so
+        ties across intents resolve to the earliest pattern, as in a linear
+        scan. Intents that score zero are absent. `boosts` defaults to the
+        keyword boosts of `normalized_input` itself.
+        """
+        user_words = set(normalized_input.split())
+        best_by_intent: dict[int, tuple[float, int]] = {}
+
+        if boosts is None:
+            boosts = self._boosted_intents(index, normalized_input)
+        for position, boost_score in boosts.items():
+            # A boosted intent scores at least the boost on its first pattern
+            best_by_intent[position] = (boost_score, index.intent_first_order[position])
+
+        for pattern_id in index.candidates(normalized_input, user_words):
+            position, order, normalized_pattern, pattern_words = index.patterns[pattern_id]
+            score = score_pattern(normalized_input, user_words, normalized_pattern, pattern_words)
+            if position in boosts:
+                score = max(score, boosts[position])
+            current = best_by_intent.get(position)
+            if current is None or score > current[0] or (score == current[0] and order < current[1]):
+                best_by_intent[position] = (score, order)
+
+        return best_by_intent
+
+    def _score_with_typo_correction(self, index: IntentIndex, user_message: str) -> dict[int, tuple[float, int]]:
+        """
+        Score the message, plus a spell-corrected copy when it contains
+        misspelled words, keeping the better score per intent.
 
-        return len(intersection) / len(union)
+        A word is only corrected when it is one keyboard typo away from a
+        single vocabulary word (see typo_index), and crisis keyword boosts
+        come from the original text only: a corrected word can add an
+        emotional boost ("anxeity" -> anxious) but never a crisis one.
+        """
+        normalized_input = normalize_text(user_message)
+        boosts = self._boosted_intents(index, normalized_input)
+        best_by_intent = self._score_intents(index, normalized_input, boosts)
+
+        corrected_input = index.typo_index.correct_text(normalized_input)
+        if corrected_input is None:
+            return best_by_intent
+
+        corrected_boosts = dict(boosts)
+        for position, boost_score in self._boosted_intents(index, corrected_input, crisis=False).items():
+            corrected_boosts[position] = max(corrected_boosts.get(position, 0.0), boost_score)
+        for position, (score, order) in self._score_intents(index, corrected_input, corrected_boosts).items():
+            current = best_by_intent.get(position)
+            if current is None or score > current[0] or (score == current[0] and order < current[1]):
+                best_by_intent[position] = (score, order)
+        return best_by_intent
 
     def match_intent(self, user_message: str, threshold: float = 0.5) -> Optional[dict]:
         """
         Match user message to an intent from the dataset.
 
+        Words missing from the dataset vocabulary are spell-corrected
+        against it (e.g. "overwhlemed" -> "overwhelmed").
+
         Args:
             user_message: The user's input message
             threshold: Minimum similarity score to consider a match (0.0 to 1.0)
@@ -81,108 +432,93 @@ class IntentMatcher:
         Returns:
             Dictionary with 'tag', 'response', and 'confidence' if matched, None otherwise
         """
-        best_match = None
-        best_score = 0.0
-
-        normalized_input = self._normalize_text(user_message)
+        index = self._index
+        best_by_intent = self._score_with_typo_correction(index, user_message)
+        if not best_by_intent:
+            return None
+
+        best_position, (best_score, _) = min(
+            best_by_intent.items(), key=lambda item: (-item[1][0], item[1][1])
+        )
+        if best_score < threshold:
+            return None
+
+        intent = index.intents[best_position]
+        responses = intent.get("responses", [])
+        return {
+            "tag": intent.get("tag", ""),
+            "response": random.choice(responses),
+            "confidence": best_score,
+            "all_responses": responses,
+            "dataset_version": index.version,
+        }
+
+    def rank_intents(self, user_message: str, k: int = 3, threshold: float = 0.0) -> IntentRanking:
+        """
+        Rank intents for a message in a single scoring pass.
 
-        for intent in self.intents:
-            tag = intent.get("tag", "")
-            patterns = intent.get("patterns", [])
-            responses = intent.get("responses", [])
+        Scores are the same confidences `match_intent` reports, so callers
+        can blend intents or gate LLM calls without matching twice.
 
-            if not patterns or not responses:
-                continue
+        Returns:
+            Up to `k` (tag, score) tuples with score > 0 and >= threshold,
+            highest first, with the dataset version they were scored against.
+        """
+        index = self._index
+        best_by_intent = self._score_with_typo_correction(index, user_message)
+        ranked = heapq.nsmallest(k, best_by_intent.items(), key=lambda item: (-item[1][0], item[1][1]))
+        return IntentRanking(
+            matches=[
+                (index.intents[position].get("tag", ""), score)
+                for position, (score, _) in ranked
+                if score >= threshold
+            ],
+            dataset_version=index.version,
+        )
+
+    def match_intents_top_k(self, user_message: str, k: int = 3, threshold: float = 0.0) -> list[tuple[str, float]]:
+        """Ranked (tag, score) tuples; see `rank_intents`."""
+        return self.rank_intents(user_message, k=k, threshold=threshold).matches
+
+    def match_intents_batch(self, messages: list[str], top_k: int = 3) -> list[list[tuple[str, float]]]:
+        """
+        Score many messages against all intents with TF-IDF cosine similarity.
 
-            for pattern in patterns:
-                score = self._calculate_similarity(user_message, pattern)
-
-                # Boost score for keyword matches in important tags
-                # Only boost if critical keywords from the tag itself are present
-                critical_keywords = {
-                    # Crisis & Safety
-                    "suicide": ["kill", "suicide", "die", "death", "end my life", "want to die", "better off dead"],
-                    "self-harm": ["hurt myself", "self harm", "cut myself", "cutting", "harming myself"],
-
-                    # Core Mental Health
-                    "depressed": ["depressed", "depression", "no interest", "feel dead inside"],
-                    "sad": ["sad", "lonely", "empty", "down", "crying", "hopeless", "broken", "forgotten"],
-                    "anxious": ["anxious", "anxiety", "worried", "panic", "nervous", "racing", "on edge"],
-                    "stressed": ["stressed", "stress", "burned", "burnout", "overwhelmed", "pressure", "drowning"],
-                    "worthless": ["worthless", "useless", "nothing", "failure", "not good enough", "pathetic", "loser"],
-                    "scared": ["scared", "afraid", "fear", "terrified", "frightened", "unsafe"],
-
-                    # Emotional States
-                    "anger": ["angry", "furious", "rage", "pissed", "mad", "irritated", "frustrated", "hate everything"],
-                    "overwhelmed": ["overwhelmed", "too much", "can't handle", "drowning", "breaking", "falling apart"],
-                    "panic-attack": ["panic attack", "can't breathe", "heart racing", "panicking", "freaking out"],
-
-                    # Life Challenges
-                    "relationship-issues": ["relationship", "partner", "boyfriend", "girlfriend", "spouse", "fighting"],
-                    "breakup": ["breakup", "broke up", "ex", "dumped", "heartbroken", "ended"],
-                    "family-issues": ["family", "parents", "toxic", "controlling", "don't understand"],
-                    "work-stress": ["job", "work", "boss", "coworkers", "overworked", "quit", "career"],
-                    "school-stress": ["school", "exams", "grades", "failing", "academic", "college", "university"],
-
-                    # Self-Image & Behavior
-                    "body-image": ["body", "ugly", "fat", "skinny", "appearance", "looks", "attractive"],
-                    "eating-issues": ["eating", "food", "binge", "restrict", "eating disorder", "skip meals"],
-                    "confidence": ["confidence", "insecure", "self esteem", "inferior", "doubt myself"],
-                    "motivation": ["motivation", "unmotivated", "no energy", "can't start", "pointless"],
-
-                    # Trauma & Addiction
-                    "trauma": ["trauma", "ptsd", "abused", "flashbacks", "haunted", "assaulted"],
-                    "addiction": ["addiction", "addicted", "can't stop", "alcohol", "drugs", "relapsing"],
-
-                    # Support Seeking
-                    "coping-strategies": ["cope", "coping", "strategies", "manage", "deal with"],
-                    "grounding": ["grounding", "disconnected", "dissociating", "not real", "floaty"],
-                    "breathing": ["breathing", "breathe", "calm down"],
-                    "affirmation": ["encouragement", "positive", "affirmation", "validation", "hope"],
-                    "self-care": ["self care", "self-care", "take care", "relax", "destress"],
-
-                    # Sleep
-                    "sleep": ["sleep", "insomnia", "can't sleep", "nightmares", "exhausted"],
-
-                    # Positive States
-                    "happy": ["happy", "great", "good", "wonderful", "amazing", "joyful", "grateful"],
-                    "achievement": ["accomplished", "proud", "achieved", "succeeded", "did it", "finished"],
-
-                    # Social
-                    "friends": ["friends", "friendless", "no friends", "lonely"],
-                    "helping-others": ["help someone", "friend is struggling", "worried about"]
-                }
-                if tag in critical_keywords:
-                    for keyword in critical_keywords[tag]:
-                        if keyword in normalized_input:
-                            # High boost for crisis/emotional keywords to override false containment matches
-                            # Use 0.95 for crisis tags, 0.88 for other emotional tags
-                            crisis_tags = {"suicide", "self-harm", "panic-attack"}
-                            boost_score = 0.95 if tag in crisis_tags else 0.92
-                            score = max(score, boost_score)
-                            break
-
-                if score > best_score:
-                    best_score = score
-                    best_match = {
-                        "tag": tag,
-                        "response": random.choice(responses),
-                        "confidence": score,
-                        "all_responses": responses
-                    }
-
-        if best_match and best_score >= threshold:
-            return best_match
+        Critical-keyword boosts apply as in `match_intent`, but pattern scores
+        are cosine similarities rather than exact/containment/Jaccard scores,
+        so values are not interchangeable with `match_intent` confidences.
 
-        return None
+        Returns:
+            Per message, up to `top_k` (tag, score) tuples with score > 0,
+            highest first.
+        """
+        from .intent_vectorizer import BATCH_CHUNK_SIZE
+
+        index = self._index
+        model = index.vector_model()
+        results: list[list[tuple[str, float]]] = []
+        for chunk_start in range(0, len(messages), BATCH_CHUNK_SIZE):
+            chunk = [normalize_text(m) for m in messages[chunk_start:chunk_start + BATCH_CHUNK_SIZE]]
+            chunk_scores = model.intent_scores([set(m.split()) for m in chunk])
+            for normalized_input, scores in zip(chunk, chunk_scores):
+                # Boosted intents may have no indexed patterns (and so no cosine score)
+                for position, boost_score in self._boosted_intents(index, normalized_input).items():
+                    scores[position] = max(scores.get(position, 0.0), boost_score)
+                # Dataset order breaks ties
+                ranked = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+                results.append([
+                    (index.intents[position].get("tag", ""), score)
+                    for position, score in ranked
+                    if score > 0
+                ])
+        return results
 
     def get_response_by_tag(self, tag: str) -> Optional[str]:
         """Get a random response for a specific intent tag."""
-        for intent in self.intents:
-            if intent.get("tag") == tag:
-                responses = intent.get("responses", [])
-                if responses:
-                    return random.choice(responses)
+        for position in self._index.tag_positions.get(tag, ()):
+            responses = self._index.intents[position].get("responses", [])
+            if responses:
+                return random.choice(responses)
         return None
 
 
@@ -196,3 +532,15 @@ def get_intent_matcher() -> IntentMatcher:
     if _intent_matcher is None:
         _intent_matcher = IntentMatcher()
     return _intent_matcher
+
+
+async def watch_intent_dataset(matcher: IntentMatcher, interval_seconds: float) -> None:
+    """Poll the dataset file and hot-reload the matcher when it changes."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            if matcher.dataset_changed():
+                # Build off the event loop so requests keep being served
+                await asyncio.to_thread(matcher.reload)
+        except Exception as e:
+            logger.error("Intent dataset reload failed: %s", e)
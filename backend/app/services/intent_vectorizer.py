@@ -0,0 +1,101 @@
+"""
+Vectorized TF-IDF scoring for the intents dataset.
+
+Scores many messages against every intent pattern with one sparse matrix
+multiply per chunk of messages. Intended for offline reprocessing of chat
+logs and bulk scoring; per-message chat routing keeps using
+`IntentMatcher.match_intent`.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy import sparse
+
+if TYPE_CHECKING:
+    from .intent_matcher import IntentIndex
+
+# Messages scored per sparse multiply; bounds the (messages x patterns) product
+BATCH_CHUNK_SIZE = 256
+
+
+class IntentVectorModel:
+    """
+    TF-IDF matrix over the normalized pattern tokens of an `IntentIndex`.
+
+    Patterns are binary bag-of-words weighted by smoothed IDF and
+    L2-normalized, so a message/pattern product is their cosine similarity.
+    An intent scores the maximum over its patterns.
+    """
+
+    def __init__(self, index: "IntentIndex"):
+        self.vocabulary: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        positions: list[int] = []
+        for row, (position, _, _, tokens) in enumerate(index.patterns):
+            for token in tokens:
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+            positions.append(position)
+
+        n_patterns = len(index.patterns)
+        n_terms = len(self.vocabulary)
+        term_frequency = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(n_patterns, n_terms),
+        )
+        document_frequency = np.bincount(np.asarray(cols, dtype=np.int64), minlength=n_terms)
+        self.idf = np.log((1 + n_patterns) / (1 + document_frequency)) + 1.0
+
+        weighted = term_frequency @ sparse.diags(self.idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        # (terms x patterns), ready for message_matrix @ pattern_matrix
+        self.pattern_matrix = (sparse.diags(1.0 / norms) @ weighted).T.tocsr()
+
+        # Pattern row -> dataset position of its intent
+        self.pattern_positions = np.asarray(positions, dtype=np.int64)
+
+    def _message_matrix(self, token_sets: list[set[str]]) -> sparse.csr_matrix:
+        rows: list[int] = []
+        cols: list[int] = []
+        values: list[float] = []
+        for row, tokens in enumerate(token_sets):
+            term_ids = [self.vocabulary[t] for t in tokens if t in self.vocabulary]
+            if not term_ids:
+                continue
+            weights = self.idf[term_ids]
+            weights = weights / np.linalg.norm(weights)
+            rows.extend([row] * len(term_ids))
+            cols.extend(term_ids)
+            values.extend(weights.tolist())
+        return sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float64), (rows, cols)),
+            shape=(len(token_sets), len(self.vocabulary)),
+        )
+
+    def intent_scores(self, token_sets: list[set[str]]) -> list[dict[int, float]]:
+        """
+        Per message, intent dataset position -> cosine score (non-zero only).
+
+        The product stays sparse: each message row only holds the patterns
+        it shares a term with, so memory follows the matches rather than
+        messages x patterns.
+        """
+        pattern_scores = (self._message_matrix(token_sets) @ self.pattern_matrix).tocsr()
+        results: list[dict[int, float]] = []
+        for row in range(len(token_sets)):
+            start, end = pattern_scores.indptr[row], pattern_scores.indptr[row + 1]
+            if start == end:
+                results.append({})
+                continue
+            positions = self.pattern_positions[pattern_scores.indices[start:end]]
+            values = pattern_scores.data[start:end]
+            # Best pattern per intent: sort by intent, highest score first
+            order = np.lexsort((-values, positions))
+            intent_positions, first = np.unique(positions[order], return_index=True)
+            # Clip float rounding so scores never exceed 1.0
+            best = np.minimum(values[order][first], 1.0)
+            results.append(dict(zip(intent_positions.tolist(), best.tolist())))
+        return results
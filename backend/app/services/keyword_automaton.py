@@ -0,0 +1,68 @@
+"""
+Aho-Corasick keyword automaton.
+
+Finds every occurrence of a fixed set of keywords in one left-to-right pass
+over the text, independent of how many keywords are compiled in.
+"""
+
+from collections import deque
+from typing import Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class KeywordAutomaton(Generic[T]):
+    """Multi-pattern substring matcher with a payload per keyword."""
+
+    def __init__(self, keywords: Iterable[tuple[str, T]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Per state: (keyword length, payload) for every keyword ending here
+        self._output: list[list[tuple[int, T]]] = [[]]
+
+        for keyword, payload in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(keyword), payload))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, T]]:
+        """Yield (start, end, payload) for every keyword occurrence in text."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in output[state]:
+                yield position - length + 1, position + 1, payload
+
+    def payloads(self, text: str) -> set[T]:
+        """Distinct payloads of all keywords found in text."""
+        return {payload for _, _, payload in self.iter_matches(text)}
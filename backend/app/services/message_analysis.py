@@ -0,0 +1,209 @@
+"""
+Single-pass analysis of a user message.
+
+`analyze_message` normalizes and tokenizes a message once, then derives
+everything the chat, playbook and wellness services branch on: crisis
+matches, casual small talk, playbook keyword scores and wellness note
+categories. Every keyword vocabulary is compiled into one automaton, so the
+message is scanned once however many keywords there are.
+
+Results are cached for the current request (context), so services that
+look at the same message share one analysis.
+"""
+
+from __future__ import annotations
+
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from .keyword_automaton import KeywordAutomaton
+from .safety import CrisisMatch, get_safety_engine
+
+CASUAL_PATTERNS = [
+    r"^(hi|hello|hey|heyy|yo|sup|hiya|howdy|morning|afternoon|evening|night)\b",
+    r"^(thanks|thank you|thx|ty)\b",
+    r"^(ok|okay|k|cool|nice|lol|lmao|haha|hmm|hm|yep|yeah|nah|nope)\b",
+]
+
+CASUAL_WORDS = {
+    "hi",
+    "hello",
+    "hey",
+    "heyy",
+    "yo",
+    "sup",
+    "hiya",
+    "howdy",
+    "morning",
+    "afternoon",
+    "evening",
+    "night",
+    "thanks",
+    "thank",
+    "you",
+    "thx",
+    "ty",
+    "ok",
+    "okay",
+    "k",
+    "cool",
+    "nice",
+    "lol",
+    "lmao",
+    "haha",
+    "hmm",
+    "hm",
+    "yep",
+    "yeah",
+    "nah",
+    "nope",
+}
+
+# Wellness note categories and the terms that place a note in them
+NOTE_CATEGORIES: dict[str, list[str]] = {
+    "academic": ["exam", "midterm", "assignment", "paper", "deadline", "grade", "class"],
+    "lonely": ["lonely", "alone", "isolated", "homesick", "no friends", "friendless"],
+    "anxious": ["anxious", "anxiety", "panic", "worried", "nervous", "on edge"],
+}
+
+_CASUAL_PATTERN = re.compile("|".join(CASUAL_PATTERNS))
+
+# Analyses kept per request context (a request rarely has more than a few)
+_MAX_CACHED_PER_REQUEST = 8
+
+
+@dataclass(frozen=True)
+class _Vocabulary:
+    automaton: KeywordAutomaton[str]
+    # keyword -> playbooks that list it
+    playbook_keywords: dict[str, tuple[str, ...]]
+    playbook_ids: tuple[str, ...]
+    # keyword -> note categories that list it
+    note_terms: dict[str, tuple[str, ...]]
+
+
+_vocabulary: Optional[_Vocabulary] = None
+
+
+def _get_vocabulary() -> _Vocabulary:
+    global _vocabulary
+    if _vocabulary is None:
+        # Imported lazily: playbook_service depends on chat_service, which uses this module
+        from .playbook_service import PLAYBOOKS
+
+        playbook_keywords: dict[str, list[str]] = {}
+        keywords: set[str] = set()
+        for playbook_id, definition in PLAYBOOKS.items():
+            if playbook_id == "general":
+                continue
+            for keyword in definition.keywords:
+                playbook_keywords.setdefault(keyword, []).append(playbook_id)
+            keywords.update(definition.keywords)
+            keywords.update(definition.action_overrides)
+
+        note_terms: dict[str, list[str]] = {}
+        for category, terms in NOTE_CATEGORIES.items():
+            for term in terms:
+                note_terms.setdefault(term, []).append(category)
+            keywords.update(terms)
+
+        _vocabulary = _Vocabulary(
+            automaton=KeywordAutomaton((keyword, keyword) for keyword in sorted(keywords)),
+            playbook_keywords={keyword: tuple(ids) for keyword, ids in playbook_keywords.items()},
+            playbook_ids=tuple(playbook_id for playbook_id in PLAYBOOKS if playbook_id != "general"),
+            note_terms={term: tuple(categories) for term, categories in note_terms.items()},
+        )
+    return _vocabulary
+
+
+@dataclass(frozen=True)
+class MessageAnalysis:
+    text: str
+    normalized: str
+    tokens: tuple[str, ...]
+    crisis_matches: tuple[CrisisMatch, ...]
+    is_casual: bool
+    # Every vocabulary keyword found in the message
+    keywords: frozenset[str]
+    # Playbook id -> number of its keywords found (PLAYBOOKS order, no "general")
+    playbook_scores: dict[str, int]
+    note_categories: frozenset[str]
+
+    @property
+    def is_crisis(self) -> bool:
+        return bool(self.crisis_matches)
+
+    def has_keyword(self, keyword: str) -> bool:
+        return keyword in self.keywords
+
+    def best_playbook(self) -> tuple[str, int]:
+        """Highest-scoring playbook (first wins ties), or ("general", 0)."""
+        best_id = "general"
+        best_score = 0
+        for playbook_id, score in self.playbook_scores.items():
+            if score > best_score:
+                best_score = score
+                best_id = playbook_id
+        return best_id, best_score
+
+
+def normalize_message(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def _is_casual(normalized: str, tokens: tuple[str, ...]) -> bool:
+    if len(normalized) <= 3:
+        return True
+    if all(char in ".!?" for char in normalized):
+        return True
+    if _CASUAL_PATTERN.match(normalized):
+        return True
+    return bool(tokens) and all(token in CASUAL_WORDS for token in tokens)
+
+
+def _analyze(text: str) -> MessageAnalysis:
+    vocabulary = _get_vocabulary()
+    normalized = normalize_message(text)
+    tokens = tuple(token for token in re.split(r"[^a-z]+", normalized) if token)
+    keywords = frozenset(vocabulary.automaton.payloads(normalized))
+
+    playbook_scores = dict.fromkeys(vocabulary.playbook_ids, 0)
+    note_categories: set[str] = set()
+    for keyword in keywords:
+        for playbook_id in vocabulary.playbook_keywords.get(keyword, ()):
+            playbook_scores[playbook_id] += 1
+        note_categories.update(vocabulary.note_terms.get(keyword, ()))
+
+    return MessageAnalysis(
+        text=text,
+        normalized=normalized,
+        tokens=tokens,
+        crisis_matches=tuple(get_safety_engine().scan(text)),
+        is_casual=not text or _is_casual(normalized, tokens),
+        keywords=keywords,
+        playbook_scores=playbook_scores,
+        note_categories=frozenset(note_categories),
+    )
+
+
+_request_cache: ContextVar[Optional[dict[str, MessageAnalysis]]] = ContextVar(
+    "message_analysis_cache", default=None
+)
+
+
+def analyze_message(text: Optional[str]) -> MessageAnalysis:
+    """Analyze a message, reusing the analysis already made in this request."""
+    text = text or ""
+    cache = _request_cache.get()
+    if cache is None:
+        # Each request runs in its own context, so this cache is per request
+        cache = {}
+        _request_cache.set(cache)
+    analysis = cache.get(text)
+    if analysis is None:
+        if len(cache) >= _MAX_CACHED_PER_REQUEST:
+            cache.pop(next(iter(cache)))
+        analysis = cache[text] = _analyze(text)
+    return analysis
@@ -4,17 +4,20 @@ import random
 from dataclasses import dataclass, field
 from typing import Optional
 
-import re
-
 from ..models.schemas import PlaybookStage, PlaybookState, PlaybookRunResponse, ResourceCardOut, ChatMode
 from .chat_service import ChatService, CASUAL_SYSTEM_PROMPT
-from .resource_service import get_resource_service, build_resource_id
-from .safety import detect_crisis, build_crisis_response, get_crisis_action_steps, get_crisis_resource_lines
+from .resource_service import get_resource_service
+from .crisis_bundle import get_crisis_bundle
+from .message_analysis import MessageAnalysis, analyze_message
 
 
 MAX_ACTIONS = 6
 MAX_RESOURCES = 5
 
+# Added to a playbook's resource queries when the message mentions an exam
+EXAM_KEYWORDS = ("exam", "midterm")
+EXAM_RESOURCE_QUERY = "Academic Skills Centre"
+
 
 @dataclass
 class PlaybookDefinition:
@@ -37,11 +40,10 @@ class PlaybookDefinition:
     def pick_follow_up(self) -> str:
         return random.choice(self.follow_up_questions)
 
-    def build_actions(self, message: str) -> list[str]:
+    def build_actions(self, analysis: MessageAnalysis) -> list[str]:
         actions = list(self.base_actions)
-        lower = message.lower()
         for keyword, additions in self.action_overrides.items():
-            if keyword in lower:
+            if analysis.has_keyword(keyword):
                 actions.extend(additions)
         return actions[:MAX_ACTIONS]
 
@@ -244,160 +246,50 @@ PLAYBOOKS: dict[str, PlaybookDefinition] = {
     ),
 }
 
-CASUAL_PATTERNS = [
-    r"^(hi|hello|hey|heyy|yo|sup|hiya|howdy|morning|afternoon|evening|night)\b",
-    r"^(thanks|thank you|thx|ty)\b",
-    r"^(ok|okay|k|cool|nice|lol|lmao|haha|hmm|hm|yep|yeah|nah|nope)\b",
-]
-
-CASUAL_WORDS = {
-    "hi",
-    "hello",
-    "hey",
-    "heyy",
-    "yo",
-    "sup",
-    "hiya",
-    "howdy",
-    "morning",
-    "afternoon",
-    "evening",
-    "night",
-    "thanks",
-    "thank",
-    "you",
-    "thx",
-    "ty",
-    "ok",
-    "okay",
-    "k",
-    "cool",
-    "nice",
-    "lol",
-    "lmao",
-    "haha",
-    "hmm",
-    "hm",
-    "yep",
-    "yeah",
-    "nah",
-    "nope",
-}
-
-
-def _normalize_message(text: str) -> str:
-    return re.sub(r"\s+", " ", text.strip().lower())
-
-
-def _is_casual_message(text: str) -> bool:
-    if not text:
-        return True
-    normalized = _normalize_message(text)
-    if len(normalized) <= 3:
-        return True
-    if all(char in ".!?" for char in normalized):
-        return True
-    for pattern in CASUAL_PATTERNS:
-        if re.match(pattern, normalized):
-            return True
-    tokens = [token for token in re.split(r"[^a-z]+", normalized) if token]
-    if tokens and all(token in CASUAL_WORDS for token in tokens):
-        return True
-    return False
-
-
 class PlaybookService:
     """Deterministic playbook engine for structured wellness flows."""
 
     def __init__(self):
         self.resource_service = get_resource_service()
-
-    def _detect_playbook(self, message: str) -> tuple[str, int]:
-        lower = message.lower()
-        best_id = "general"
-        best_score = 0
-
+        # (playbook_id, mentions_exam) -> resource cards, for one catalogue version
+        self._resource_bundles: dict[tuple[str, bool], list[ResourceCardOut]] = {}
+        self._bundles_version: Optional[str] = None
+
+    def init_resource_bundles(self) -> None:
+        """(Re)build every playbook's resource cards; call once resources have loaded."""
+        version = self.resource_service.version
+        bundles: dict[tuple[str, bool], list[ResourceCardOut]] = {}
         for playbook_id, definition in PLAYBOOKS.items():
-            if playbook_id == "general":
-                continue
-            score = sum(1 for keyword in definition.keywords if keyword in lower)
-            if score > best_score:
-                best_score = score
-                best_id = playbook_id
-
-        return best_id, best_score
-
-    def _collect_resources(self, playbook_id: str, message: str) -> list[ResourceCardOut]:
-        if not self.resource_service.is_loaded:
-            return []
-
-        definition = PLAYBOOKS.get(playbook_id, PLAYBOOKS["general"])
-        queries = list(definition.resource_queries)
-        lower = message.lower()
-        if "exam" in lower or "midterm" in lower:
-            queries.append("Academic Skills Centre")
-
-        results = []
-        seen_ids = set()
-        for query in queries:
-            for item in self.resource_service.search(query, limit=2):
-                resource_id = item.get("id") or build_resource_id(item.get("name", ""))
-                if resource_id in seen_ids:
-                    continue
-                seen_ids.add(resource_id)
-                results.append(ResourceCardOut(**{**item, "id": resource_id}))
-                if len(results) >= MAX_RESOURCES:
-                    return results
-        return results
-
-    def _collect_crisis_resources(self) -> list[ResourceCardOut]:
-        if not self.resource_service.is_loaded:
-            return []
-
-        # Tight, safety-focused resource set (avoid unrelated clinics).
-        queries = [
-            "UVic Counselling",
-            "Student Wellness Centre",
-            "Student Wellness",
-        ]
-        results: list[ResourceCardOut] = []
-        seen_ids: set[str] = set()
-        for query in queries:
-            for item in self.resource_service.search(query, limit=3):
-                name = item.get("name", "").lower()
-                # Exclude unrelated clinics/services (e.g., sexual health).
-                if "sexual health" in name:
-                    continue
-                resource_id = item.get("id") or build_resource_id(item.get("name", ""))
-                if resource_id in seen_ids:
-                    continue
-                seen_ids.add(resource_id)
-                results.append(ResourceCardOut(**{**item, "id": resource_id}))
-                if len(results) >= MAX_RESOURCES:
-                    return results
-        return results
-
-    def run(self, message: str, state: Optional[PlaybookState] = None) -> PlaybookRunResponse:
-        if detect_crisis(message):
-            crisis_actions = get_crisis_action_steps() + get_crisis_resource_lines()
-            resources = self._collect_crisis_resources()
-            resource_ids = [resource.id for resource in resources]
-            return PlaybookRunResponse(
-                playbook_id="crisis",
-                stage=PlaybookStage.PLAN,
-                validation=build_crisis_response(),
-                triage_question=None,
-                action_title="Immediate support steps",
-                actions=crisis_actions[:MAX_ACTIONS],
-                resource_ids=resource_ids,
-                resources=resources,
-                next_state=PlaybookState(playbook_id="crisis", stage=PlaybookStage.PLAN),
-            )
+            for mentions_exam in (False, True):
+                queries = list(definition.resource_queries)
+                if mentions_exam:
+                    queries.append(EXAM_RESOURCE_QUERY)
+                bundles[(playbook_id, mentions_exam)] = self.resource_service.search_many(
+                    queries, per_query_limit=2, total_limit=MAX_RESOURCES
+                )
+        # Swap both together so lookups never mix catalogue versions
+        self._resource_bundles, self._bundles_version = bundles, version
+
+    def _collect_resources(self, playbook_id: str, analysis: MessageAnalysis) -> list[ResourceCardOut]:
+        if self._bundles_version != self.resource_service.version:
+            # Resources (re)loaded since the bundles were built
+            self.init_resource_bundles()
+        if playbook_id not in PLAYBOOKS:
+            playbook_id = "general"
+        mentions_exam = any(analysis.has_keyword(keyword) for keyword in EXAM_KEYWORDS)
+        # Cards are shared across requests; the list is copied for the response
+        return list(self._resource_bundles[(playbook_id, mentions_exam)])
+
+    async def run(self, message: str, state: Optional[PlaybookState] = None) -> PlaybookRunResponse:
+        analysis = analyze_message(message)
+        if analysis.is_crisis:
+            # Copy so callers can't alter the shared precomputed payload
+            return get_crisis_bundle().playbook.model_copy(deep=True)
 
         state = state or PlaybookState()
-        playbook_id, score = self._detect_playbook(message)
-        if _is_casual_message(message) or score == 0:
-            response = ChatService.get_contextual_response(
+        playbook_id, score = analysis.best_playbook()
+        if analysis.is_casual or score == 0:
+            response = await ChatService.get_contextual_response_async(
                 message=message,
                 mode=ChatMode.WELLNESS,
                 system_prompt_override=CASUAL_SYSTEM_PROMPT,
@@ -418,13 +310,13 @@ class PlaybookService:
         definition = PLAYBOOKS.get(playbook_id, PLAYBOOKS["general"])
         stage = state.stage or PlaybookStage.VENT
 
-        resources = self._collect_resources(playbook_id, message)
+        resources = self._collect_resources(playbook_id, analysis)
         resource_ids = [resource.id for resource in resources]
 
         if stage == PlaybookStage.VENT:
             validation = definition.pick_validation()
             triage_question = definition.pick_triage_question()
-            actions = definition.build_actions(message)
+            actions = definition.build_actions(analysis)
             action_title = "Quick reset"
             context = dict(state.context or {})
             context["initial_message"] = message
@@ -436,7 +328,7 @@ class PlaybookService:
         elif stage == PlaybookStage.TRIAGE:
             validation = definition.pick_validation()
             triage_question = definition.pick_follow_up()
-            actions = definition.build_actions(message)
+            actions = definition.build_actions(analysis)
             action_title = definition.action_title
             context = dict(state.context or {})
             context["triage_message"] = message
@@ -448,7 +340,7 @@ class PlaybookService:
         else:
             validation = "Here is a mini plan you can try."
             triage_question = None
-            actions = definition.build_actions(message)
+            actions = definition.build_actions(analysis)
             action_title = definition.action_title
             next_state = PlaybookState(
                 playbook_id=playbook_id,
@@ -0,0 +1,105 @@
+"""
+BM25 ranking over the resource catalogue.
+
+Each resource is treated as one document whose fields are weighted like the
+substring scorer (name 3, description 2, category 1, location 1): a term's
+frequency is the weighted sum of its per-field counts, and the document
+length is the weighted sum of field lengths. Synonyms are folded to one
+canonical term on both sides, so "counseling" matches "counselling".
+
+Everything except the query terms is known at load time, so each posting
+stores its full BM25 contribution and a query only sums postings.
+"""
+
+import math
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .resource_service import ResourceCard
+
+# Mirrors ResourceService._calculate_score's field weighting
+FIELD_WEIGHTS = {"name": 3.0, "description": 2.0, "categories": 1.0, "location": 1.0}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Variant -> canonical term, applied to resources and queries alike
+SYNONYMS = {
+    "counseling": "counselling",
+    "counsellor": "counselling",
+    "counselor": "counselling",
+    "counsellors": "counselling",
+    "counselors": "counselling",
+    "health": "wellness",
+    "wellbeing": "wellness",
+    "center": "centre",
+    "therapist": "therapy",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "at", "for", "i", "in", "is", "it", "me", "my",
+    "of", "on", "or", "the", "to", "with",
+    # Contraction fragments left by the tokenizer ("i'm", "it's", "don't")
+    "m", "s", "t", "re", "ve", "ll", "d",
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stopwords dropped and synonyms folded."""
+    return [
+        SYNONYMS.get(token, token)
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+class ResourceBM25:
+    """Precomputed BM25 postings: term -> [(resource position, contribution)]."""
+
+    def __init__(self, resources: list["ResourceCard"]):
+        weighted_tfs: list[dict[str, float]] = []
+        lengths: list[float] = []
+        for resource in resources:
+            fields = {
+                "name": resource.name_lower,
+                "description": resource.description_lower,
+                "categories": " ".join(resource.categories_lower),
+                "location": resource.location_lower,
+            }
+            tf: dict[str, float] = {}
+            length = 0.0
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                tokens = tokenize(text)
+                length += weight * len(tokens)
+                for token in tokens:
+                    tf[token] = tf.get(token, 0.0) + weight
+            weighted_tfs.append(tf)
+            lengths.append(length)
+
+        total = len(resources)
+        average_length = (sum(lengths) / total) if total else 0.0
+        document_frequency: dict[str, int] = {}
+        for tf in weighted_tfs:
+            for term in tf:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+        for position, (tf, length) in enumerate(zip(weighted_tfs, lengths)):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length) if average_length else BM25_K1
+            for term, frequency in tf.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                contribution = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                self.postings.setdefault(term, []).append((position, contribution))
+
+    def scores(self, query: str) -> dict[int, float]:
+        """BM25 score per resource position for every resource sharing a term."""
+        totals: dict[int, float] = {}
+        for term in tokenize(query):
+            for position, contribution in self.postings.get(term, ()):
+                totals[position] = totals.get(position, 0.0) + contribution
+        return totals
@@ -0,0 +1,153 @@
+"""
+Local "semantic" ranking over the resource catalogue.
+
+Each resource's name, description and categories are turned into character
+n-gram TF-IDF vectors (sublinear term frequency, smoothed IDF, L2-normalized)
+once per catalogue, on its first semantic search. A query is vectorized the
+same way and every resource is scored with one sparse matrix-vector product,
+so the cosine similarity is tolerant of misspellings and word forms
+("conselling", "counsellors").
+
+Character n-grams cannot link a paraphrase to words it does not share, so
+free-text cue words ("talk", "hungry", "rent") are first expanded to the
+catalogue's own vocabulary (QUERY_EXPANSIONS). Everything runs in process:
+no network, GPU or external model.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from scipy import sparse
+
+from .resource_bm25 import tokenize
+
+if TYPE_CHECKING:
+    from .resource_service import ResourceCard
+
+# Character n-gram lengths, taken within space-padded words
+NGRAM_RANGE = (3, 5)
+
+# Name counts double, mirroring its lead in the substring and BM25 scorers
+FIELD_WEIGHTS = {"name": 2.0, "description": 1.0, "categories": 1.0}
+
+# Results below this cosine similarity are noise (shared common n-grams)
+MIN_SIMILARITY = 0.1
+
+# Free-text cue word -> catalogue terms added to the query
+QUERY_EXPANSIONS = {
+    "talk": "counselling wellness support",
+    "someone": "counselling support",
+    "listen": "counselling support",
+    "therapy": "counselling mental",
+    "depressed": "counselling mental wellness",
+    "depression": "counselling mental wellness",
+    "sad": "counselling mental wellness",
+    "anxious": "counselling mental wellness",
+    "anxiety": "counselling mental wellness",
+    "stress": "counselling wellness",
+    "stressed": "counselling wellness",
+    "overwhelmed": "counselling wellness",
+    "lonely": "community multifaith peer",
+    "alone": "community multifaith peer",
+    "sick": "wellness clinic",
+    "doctor": "wellness clinic",
+    "hungry": "food",
+    "eat": "food",
+    "money": "financial aid awards",
+    "afford": "financial aid awards",
+    "rent": "financial aid housing",
+    "broke": "financial aid awards",
+    "tuition": "financial aid fees",
+    "essay": "writing academic skills",
+    "study": "academic skills learning",
+    "job": "career employment",
+    "work": "career employment",
+    "pray": "multifaith spiritual",
+    "faith": "multifaith spiritual",
+    "unsafe": "safewalk security",
+    "assaulted": "sexualized violence support",
+}
+
+
+@lru_cache(maxsize=65536)
+def _token_ngrams(token: str) -> tuple[str, ...]:
+    padded = f" {token} "
+    low, high = NGRAM_RANGE
+    return tuple(padded[start:start + n] for n in range(low, high + 1) for start in range(len(padded) - n + 1))
+
+
+def char_ngrams(text: str) -> dict[str, int]:
+    """Counts of word-bounded character n-grams over the tokenized text."""
+    counts: dict[str, int] = {}
+    # Catalogue text repeats its words, so each word's n-grams are cut once
+    for token in tokenize(text):
+        for gram in _token_ngrams(token):
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def expand_query(query: str) -> str:
+    """Append the catalogue terms for any cue words in the query."""
+    expansions = [QUERY_EXPANSIONS[token] for token in tokenize(query) if token in QUERY_EXPANSIONS]
+    return " ".join([query, *expansions]) if expansions else query
+
+
+class ResourceSemanticModel:
+    """Character n-gram TF-IDF matrix (resources x n-grams), L2-normalized rows."""
+
+    def __init__(self, resources: list["ResourceCard"]):
+        self.vocabulary: dict[str, int] = {}
+        # word -> its n-gram ids; the loop below is per word, not per n-gram
+        word_grams: dict[str, np.ndarray] = {}
+        rows: list[int] = []
+        weights: list[float] = []
+        gram_chunks: list[np.ndarray] = []
+        for row, resource in enumerate(resources):
+            fields = {
+                "name": resource.name,
+                "description": resource.description,
+                "categories": " ".join(resource.categories),
+            }
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    gram_ids = word_grams.get(token)
+                    if gram_ids is None:
+                        gram_ids = word_grams[token] = np.fromiter(
+                            (self.vocabulary.setdefault(gram, len(self.vocabulary)) for gram in _token_ngrams(token)),
+                            dtype=np.int64,
+                        )
+                    rows.append(row)
+                    weights.append(FIELD_WEIGHTS[field])
+                    gram_chunks.append(gram_ids)
+
+        n_resources = len(resources)
+        n_terms = len(self.vocabulary)
+        lengths = np.fromiter((len(chunk) for chunk in gram_chunks), dtype=np.int64, count=len(gram_chunks))
+        cols = np.concatenate(gram_chunks) if gram_chunks else np.zeros(0, dtype=np.int64)
+        # Repeated (resource, n-gram) entries are summed into weighted counts
+        term_frequency = sparse.csr_matrix(
+            (np.repeat(np.asarray(weights, dtype=np.float64), lengths), (np.repeat(np.asarray(rows, dtype=np.int64), lengths), cols)),
+            shape=(n_resources, n_terms),
+        )
+        term_frequency.sum_duplicates()
+        term_frequency.data = 1.0 + np.log(term_frequency.data)
+        document_frequency = np.bincount(term_frequency.indices, minlength=n_terms)
+        self.idf = np.log((1 + n_resources) / (1 + document_frequency)) + 1.0
+
+        weighted_matrix = term_frequency @ sparse.diags(self.idf)
+        norms = np.sqrt(np.asarray(weighted_matrix.multiply(weighted_matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        # Column-major: a query only touches the columns of its own n-grams
+        self.matrix = (sparse.diags(1.0 / norms) @ weighted_matrix).tocsc()
+
+    def scores(self, query: str) -> Optional[np.ndarray]:
+        """Cosine similarity of every resource to the query (None if no n-gram is known)."""
+        counts = char_ngrams(expand_query(query))
+        term_ids = [self.vocabulary[gram] for gram in counts if gram in self.vocabulary]
+        if not term_ids:
+            return None
+        frequencies = np.asarray([counts[gram] for gram in counts if gram in self.vocabulary], dtype=np.float64)
+        weights = (1.0 + np.log(frequencies)) * self.idf[term_ids]
+        weights /= np.linalg.norm(weights)
+        return self.matrix[:, term_ids] @ weights
@@ -1,13 +1,35 @@
 """
 Resource service for UVic student resources search.
 Loads resources from JSON at startup and provides search functionality.
+
+Searches go through a `ResourceIndex` built at load time, so their cost
+follows the number of matching resources rather than the catalogue size.
+Rankings and merged card lists are cached per catalogue version.
+
+The catalogue can be reloaded while serving (file watch or admin trigger):
+the new catalogue and its index are built aside and swapped in with one
+assignment, so a search sees either the old or the new catalogue.
 """
 
+import asyncio
+import hashlib
+import heapq
 import json
 import logging
 import re
+import threading
+from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from ..config import settings
+from ..models.schemas import ResourceCardOut
+from .resource_bm25 import ResourceBM25
+from .resource_cache import ResourceResultCache
+from .resource_suggest import ResourceSuggestIndex, ResourceSuggestion
+
+if TYPE_CHECKING:
+    from .resource_semantic import ResourceSemanticModel
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +40,36 @@ def build_resource_id(name: str) -> str:
     return slug or "resource"
 
 
+# Gram length for the vocabulary substring index
+SUBSTRING_GRAM = 3
+
+# Length of the file-digest prefix reported as the catalogue version
+CATALOGUE_VERSION_LENGTH = 12
+
+
+class ResourceSearchMode(str, Enum):
+    """Ranking used by ResourceService.search."""
+    SUBSTRING = "substring"  # whole query as a substring, weighted by field
+    BM25 = "bm25"            # multi-term BM25 with field weights and synonyms
+    SEMANTIC = "semantic"    # character n-gram TF-IDF cosine, with cue-word expansion
+
+
 class ResourceCard:
     """Represents a UVic student resource."""
 
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "categories",
+        "url",
+        "location",
+        "name_lower",
+        "description_lower",
+        "categories_lower",
+        "location_lower",
+    )
+
     def __init__(
         self,
         name: str,
@@ -36,6 +85,11 @@ class ResourceCard:
         self.categories = categories
         self.url = url
         self.location = location
+        # Lowercased once for case-insensitive matching
+        self.name_lower = name.lower()
+        self.description_lower = description.lower()
+        self.categories_lower = tuple(category.lower() for category in categories)
+        self.location_lower = location.lower() if location else ""
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -51,33 +105,143 @@ class ResourceCard:
         return result
 
 
+class ResourceIndex:
+    """
+    Search index over the resource catalogue.
+
+    Every lowercased field is split on whitespace into tokens, with a
+    token -> resource posting list. Token trigrams map to the tokens that
+    contain them. A query piece without whitespace can only occur inside
+    a single field token, so the resources holding a token that contains
+    every query piece are a superset of the matches. Only those resources
+    are scored.
+    """
+
+    def __init__(self, resources: list[ResourceCard], version: str = ""):
+        self.resources = resources
+        # Digest of the source file; part of every result cache key
+        self.version = version
+        self.token_postings: dict[str, list[int]] = {}
+        for position, resource in enumerate(resources):
+            fields = (resource.name_lower, resource.description_lower, resource.location_lower) + resource.categories_lower
+            for token in {token for field in fields for token in field.split()}:
+                self.token_postings.setdefault(token, []).append(position)
+
+        self.tokens: list[str] = list(self.token_postings)
+        self.grams: dict[str, list[int]] = {}
+        # Pieces shorter than a gram are looked up whole: every 1..n-1 char substring
+        self.short_pieces: dict[str, list[int]] = {}
+        for token_id, token in enumerate(self.tokens):
+            for gram in {token[i:i + SUBSTRING_GRAM] for i in range(len(token) - SUBSTRING_GRAM + 1)}:
+                self.grams.setdefault(gram, []).append(token_id)
+            short = {token[i:i + n] for n in range(1, SUBSTRING_GRAM) for i in range(len(token) - n + 1)}
+            for piece in short:
+                self.short_pieces.setdefault(piece, []).append(token_id)
+
+        # Category facets, keyed by lowercased name: positions ordered by
+        # resource name then catalogue position, so pages are stable
+        self.category_names: dict[str, str] = {}
+        self.category_positions: dict[str, list[int]] = {}
+        for position, resource in enumerate(resources):
+            for category, category_lower in zip(resource.categories, resource.categories_lower):
+                self.category_names.setdefault(category_lower, category)
+                positions = self.category_positions.setdefault(category_lower, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+        for positions in self.category_positions.values():
+            positions.sort(key=lambda position: (resources[position].name_lower, position))
+        self.category_sets = {category: frozenset(positions) for category, positions in self.category_positions.items()}
+
+        self.bm25 = ResourceBM25(resources)
+        self.suggestions = ResourceSuggestIndex(resources)
+        self._semantic_model: Optional["ResourceSemanticModel"] = None
+
+    def semantic_model(self) -> "ResourceSemanticModel":
+        """
+        Character n-gram TF-IDF model (needs NumPy/SciPy). `load_resources`
+        builds it before the swap unless `resource_semantic_preload` is off;
+        otherwise it is built on first use.
+        """
+        if self._semantic_model is None:
+            from .resource_semantic import ResourceSemanticModel
+
+            self._semantic_model = ResourceSemanticModel(self.resources)
+        return self._semantic_model
+
+    def _tokens_containing(self, piece: str) -> list[str]:
+        if len(piece) < SUBSTRING_GRAM:
+            return [self.tokens[token_id] for token_id in self.short_pieces.get(piece, ())]
+        candidate_ids: Optional[set[int]] = None
+        for gram in {piece[i:i + SUBSTRING_GRAM] for i in range(len(piece) - SUBSTRING_GRAM + 1)}:
+            posting = self.grams.get(gram)
+            if not posting:
+                return []
+            candidate_ids = set(posting) if candidate_ids is None else candidate_ids.intersection(posting)
+            if not candidate_ids:
+                return []
+        tokens = self.tokens
+        return [tokens[token_id] for token_id in candidate_ids if piece in tokens[token_id]]
+
+    def candidates(self, query_lower: str) -> set[int]:
+        """Positions of resources that may contain `query_lower` in some field."""
+        pieces = []
+        for piece in set(query_lower.split()):
+            tokens = self._tokens_containing(piece)
+            if not tokens:
+                return set()
+            pieces.append((sum(len(self.token_postings[token]) for token in tokens), tokens))
+
+        # Start from the most selective piece; stop narrowing once the other
+        # pieces' postings outweigh the candidates (scoring re-checks anyway)
+        pieces.sort(key=lambda item: item[0])
+        result: set[int] = set()
+        for size, tokens in pieces:
+            if result and size > len(result):
+                break
+            matches: set[int] = set()
+            for token in tokens:
+                matches.update(self.token_postings[token])
+            result = matches if not result else result & matches
+            if not result:
+                break
+        return result
+
+
 class ResourceService:
     """Service for loading and searching UVic student resources."""
 
-    def __init__(self):
-        self._resources: list[ResourceCard] = []
+    def __init__(self, cache_size: int = 1024):
+        self._index = ResourceIndex([])
+        self._cache = ResourceResultCache(cache_size)
         self._load_error: Optional[str] = None
         self._loaded = False
+        self._path: Optional[Path] = None
+        self._file_stat: Optional[tuple[int, int]] = None
+        self._reload_lock = threading.Lock()
+        # Called (in the reloading thread) after a new catalogue is swapped in
+        self._reload_listeners: list[Callable[[], None]] = []
 
     def load_resources(self, json_path: str | Path) -> bool:
         """
         Load resources from JSON file.
         Returns True if successful, False otherwise.
+
+        On failure the previously loaded catalogue (if any) keeps serving.
         """
         try:
             path = Path(json_path)
+            self._path = path
             if not path.exists():
                 self._load_error = f"Resource file not found: {json_path}"
                 logger.error(self._load_error)
                 return False
 
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            file_stat = _stat_signature(path)
+            raw = path.read_bytes()
+            data = json.loads(raw.decode("utf-8"))
 
-            resources_data = data.get("resources", [])
-            self._resources = []
-
-            for item in resources_data:
+            resources: list[ResourceCard] = []
+            for item in data.get("resources", []):
                 resource = ResourceCard(
                     name=item.get("name", ""),
                     description=item.get("description", ""),
@@ -86,11 +250,24 @@ class ResourceService:
                     location=item.get("location"),
                     resource_id=item.get("id"),
                 )
-                self._resources.append(resource)
-
+                resources.append(resource)
+
+            version = hashlib.sha1(raw).hexdigest()[:CATALOGUE_VERSION_LENGTH]
+            index = ResourceIndex(resources, version)
+            if settings.resource_semantic_preload:
+                # Reloads run in a worker thread, so the first semantic search
+                # after a swap doesn't build the model on the event loop
+                try:
+                    index.semantic_model()
+                except ImportError as e:
+                    logger.warning("Semantic resource search unavailable: %s", e)
+            # Single reference assignment: readers see the old or new index, never a mix
+            self._index = index
+            self._file_stat = file_stat
+            self._cache.clear()
             self._loaded = True
             self._load_error = None
-            logger.info("Loaded %d resources from %s", len(self._resources), json_path)
+            logger.info("Loaded %d resources from %s (version %s)", len(resources), json_path, version)
             return True
 
         except json.JSONDecodeError as e:
@@ -112,6 +289,55 @@ class ResourceService:
         """Get the load error message if loading failed."""
         return self._load_error
 
+    @property
+    def version(self) -> str:
+        """Digest prefix of the loaded catalogue file ("" before loading)."""
+        return self._index.version
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """Run `listener` after each reload that swaps in a new catalogue."""
+        self._reload_listeners.append(listener)
+
+    def catalogue_changed(self) -> bool:
+        """Cheap check (size + mtime) for edits to the catalogue file."""
+        return (
+            self._path is not None
+            and self._path.exists()
+            and _stat_signature(self._path) != self._file_stat
+        )
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the catalogue from its file and swap it in atomically.
+
+        Searches already in flight keep the index they started with. A file
+        that fails to parse (e.g. mid-write) leaves the current catalogue
+        serving. Returns True if a new catalogue was swapped in.
+        """
+        with self._reload_lock:
+            if self._path is None or not self._path.exists():
+                return False
+            digest = hashlib.sha1(self._path.read_bytes()).hexdigest()[:CATALOGUE_VERSION_LENGTH]
+            if not force and self._loaded and digest == self.version:
+                self._file_stat = _stat_signature(self._path)
+                return False
+
+            previous_version = self.version
+            if not self.load_resources(self._path):
+                return False
+            logger.info("Resource catalogue reloaded: %s -> %s", previous_version or "none", self.version)
+
+        for listener in self._reload_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error("Resource reload listener failed: %s", e)
+        return True
+
+    def cache_stats(self) -> dict:
+        """Result cache size and hit-rate counters."""
+        return {"catalogue_version": self.version, **self._cache.stats()}
+
     def _calculate_score(self, resource: ResourceCard, query_lower: str) -> int:
         """
         Calculate relevance score for a resource based on query matches.
@@ -123,54 +349,226 @@ class ResourceService:
         score = 0
 
         # Name match (+3)
-        if query_lower in resource.name.lower():
+        if query_lower in resource.name_lower:
             score += 3
 
         # Description match (+2)
-        if query_lower in resource.description.lower():
+        if query_lower in resource.description_lower:
             score += 2
 
         # Category match (+1)
-        for category in resource.categories:
-            if query_lower in category.lower():
+        for category in resource.categories_lower:
+            if query_lower in category:
                 score += 1
                 break  # Only count category match once
 
         # Location match (+1)
-        if resource.location and query_lower in resource.location.lower():
+        if resource.location_lower and query_lower in resource.location_lower:
             score += 1
 
         return score
 
-    def search(self, query: Optional[str], limit: int = 5) -> list[dict]:
+    def search(
+        self,
+        query: Optional[str],
+        limit: int = 5,
+        mode: ResourceSearchMode = ResourceSearchMode.SUBSTRING,
+        category: Optional[str] = None,
+    ) -> tuple[list[dict], str]:
         """
         Search resources by query string.
-        Returns top `limit` results sorted by score desc, then name asc.
-        Returns empty list if query is empty or no matches found.
+        Returns (top `limit` results sorted by score desc, then name asc,
+        version of the catalogue they came from). The results are empty if
+        the query is empty or nothing matches.
+        `category` (case-insensitive) restricts results to that category.
         """
-        if not query or not query.strip():
-            return []
+        # One snapshot, so the version always matches the results despite reloads
+        index = self._index
+        if not query or not query.strip() or not self._loaded:
+            return [], index.version
 
-        if not self._loaded:
-            return []
+        category_lower = category.strip().lower() if category and category.strip() else None
+        positions = self._ranked(index, query.strip().lower(), limit, ResourceSearchMode(mode), category_lower)
+        return [index.resources[position].to_dict() for position in positions], index.version
+
+    def category_counts(self) -> tuple[list[tuple[str, int]], str]:
+        """
+        (category, resource count) for every category, largest first, and
+        the version of the catalogue they were counted in.
+        """
+        index = self._index
+        counts = sorted(
+            ((index.category_names[category], len(positions)) for category, positions in index.category_positions.items()),
+            key=lambda item: (-item[1], item[0].lower()),
+        )
+        return counts, index.version
+
+    def list_category(self, category: str, offset: int = 0, limit: int = 20) -> tuple[int, list[dict], str]:
+        """
+        One page of a category's resources, ordered by name.
+        Returns (total resources in the category, page, catalogue version).
+        Unknown categories are empty.
+        """
+        index = self._index
+        positions = index.category_positions.get(category.strip().lower(), [])
+        page = positions[max(offset, 0):max(offset, 0) + max(limit, 0)]
+        return len(positions), [index.resources[position].to_dict() for position in page], index.version
 
-        query_lower = query.strip().lower()
+    def suggest(self, prefix: Optional[str], limit: int = 8) -> tuple[list[ResourceSuggestion], str]:
+        """
+        Typeahead: names, categories and locations with a word starting with
+        `prefix`. Returns (suggestions, version of the catalogue they came from).
+        """
+        index = self._index
+        if not prefix or not self._loaded:
+            return [], index.version
+        return index.suggestions.suggest(prefix, limit), index.version
 
-        # Calculate scores for all resources
-        scored_resources: list[tuple[int, str, ResourceCard]] = []
-        for resource in self._resources:
+    def _ranked(
+        self,
+        index: ResourceIndex,
+        query_lower: str,
+        limit: int,
+        mode: ResourceSearchMode,
+        category_lower: Optional[str] = None,
+    ) -> tuple[int, ...]:
+        """Cached ranking of `query_lower` against one catalogue version."""
+        if category_lower is not None:
+            allowed = index.category_sets.get(category_lower)
+            if not allowed:
+                return ()
+        else:
+            allowed = None
+        if mode == ResourceSearchMode.BM25:
+            compute = lambda: self._rank_bm25(index, query_lower, limit, allowed)
+        elif mode == ResourceSearchMode.SEMANTIC:
+            compute = lambda: self._rank_semantic(index, query_lower, limit, allowed)
+        else:
+            compute = lambda: self._rank_substring(index, query_lower, limit, allowed)
+        key = ("rank", index.version, mode.value, query_lower, limit, category_lower)
+        return self._cache.get_or_compute(key, compute)
+
+    def _rank_substring(
+        self,
+        index: ResourceIndex,
+        query_lower: str,
+        limit: int,
+        allowed: Optional[frozenset[int]] = None,
+    ) -> tuple[int, ...]:
+        """Positions of the top `limit` substring matches, best first."""
+        # Score only the resources the index says can match
+        resources = index.resources
+        candidates = index.candidates(query_lower)
+        if allowed is not None:
+            candidates &= allowed
+        scored_resources: list[tuple[int, str, int]] = []
+        for position in candidates:
+            resource = resources[position]
             score = self._calculate_score(resource, query_lower)
             if score > 0:
-                # Store (negative_score, name, resource) for sorting
-                # Negative score for descending order, name for ascending tiebreak
-                scored_resources.append((score, resource.name, resource))
+                # Catalogue position keeps ties in their original order
+                scored_resources.append((score, resource.name, position))
 
         # Sort by score descending, then name ascending
-        scored_resources.sort(key=lambda x: (-x[0], x[1]))
+        scored_resources.sort(key=lambda x: (-x[0], x[1], x[2]))
+        return tuple(position for _, _, position in scored_resources[:limit])
 
-        # Return top `limit` results as dictionaries
-        results = [resource.to_dict() for _, _, resource in scored_resources[:limit]]
-        return results
+    def search_many(
+        self,
+        queries: Iterable[str],
+        per_query_limit: int = 2,
+        total_limit: int = 5,
+        exclude: Optional[Callable[[ResourceCard], bool]] = None,
+    ) -> list[ResourceCardOut]:
+        """
+        Merge the top results of several queries, in query order.
+
+        Each query contributes its top `per_query_limit` substring matches;
+        resources already taken or rejected by `exclude` are skipped (they
+        still use up that query's slots). Stops at `total_limit` results.
+
+        The card list is cached unless `exclude` is given (a predicate cannot
+        be part of a cache key); rankings are cached either way. Cards are
+        shared between callers and must not be mutated.
+        """
+        if not self._loaded:
+            return []
+
+        index = self._index
+        query_keys = tuple(query.strip().lower() for query in queries if query and query.strip())
+
+        def merge() -> tuple[ResourceCardOut, ...]:
+            results: list[ResourceCardOut] = []
+            seen_ids: set[str] = set()
+            for query_lower in query_keys:
+                for position in self._ranked(index, query_lower, per_query_limit, ResourceSearchMode.SUBSTRING):
+                    resource = index.resources[position]
+                    if exclude and exclude(resource):
+                        continue
+                    if resource.id in seen_ids:
+                        continue
+                    seen_ids.add(resource.id)
+                    results.append(ResourceCardOut(**resource.to_dict()))
+                    if len(results) >= total_limit:
+                        return tuple(results)
+            return tuple(results)
+
+        if exclude is not None:
+            return list(merge())
+        key = ("cards", index.version, query_keys, per_query_limit, total_limit)
+        return list(self._cache.get_or_compute(key, merge))
+
+    def _rank_bm25(
+        self,
+        index: ResourceIndex,
+        query: str,
+        limit: int,
+        allowed: Optional[frozenset[int]] = None,
+    ) -> tuple[int, ...]:
+        """Rank by BM25 over all query terms (any term may match)."""
+        resources = index.resources
+        scores = index.bm25.scores(query)
+        items = scores.items() if allowed is None else [item for item in scores.items() if item[0] in allowed]
+        top = heapq.nsmallest(
+            limit,
+            items,
+            key=lambda item: (-item[1], resources[item[0]].name, item[0]),
+        )
+        return tuple(position for position, _ in top)
+
+    def _rank_semantic(
+        self,
+        index: ResourceIndex,
+        query: str,
+        limit: int,
+        allowed: Optional[frozenset[int]] = None,
+    ) -> tuple[int, ...]:
+        """Rank by character n-gram cosine similarity (see resource_semantic)."""
+        import numpy as np
+
+        from .resource_semantic import MIN_SIMILARITY
+
+        scores = index.semantic_model().scores(query)
+        if scores is None or limit <= 0:
+            return ()
+        positions = np.flatnonzero(scores >= MIN_SIMILARITY)
+        if allowed is not None:
+            positions = np.asarray([position for position in positions if position in allowed], dtype=np.int64)
+        if len(positions) > limit:
+            # Keep everything tied with the limit-th score, then order exactly below
+            cutoff = np.partition(scores[positions], -limit)[-limit]
+            positions = positions[scores[positions] >= cutoff]
+        resources = index.resources
+        ranked = sorted(
+            (int(position) for position in positions),
+            key=lambda position: (-scores[position], resources[position].name, position),
+        )
+        return tuple(ranked[:limit])
+
+
+def _stat_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
 
 
 # Global singleton instance
@@ -181,7 +579,7 @@ def get_resource_service() -> ResourceService:
     """Get the global resource service instance."""
     global _resource_service
     if _resource_service is None:
-        _resource_service = ResourceService()
+        _resource_service = ResourceService(cache_size=settings.resource_cache_max_entries)
     return _resource_service
 
 
@@ -191,3 +589,15 @@ def init_resource_service(json_path: str | Path) -> ResourceService:
     if not service.is_loaded:
         service.load_resources(json_path)
     return service
+
+
+async def watch_resource_catalogue(service: ResourceService, interval_seconds: float) -> None:
+    """Poll the catalogue file and hot-reload the service when it changes."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            if service.catalogue_changed():
+                # Build off the event loop so requests keep being served
+                await asyncio.to_thread(service.reload)
+        except Exception as e:
+            logger.error("Resource catalogue reload failed: %s", e)
@@ -0,0 +1,121 @@
+"""
+Typeahead suggestions over resource names, categories and locations.
+
+Every phrase is indexed once per word start ("UVic Counselling" under both
+"uvic counselling" and "counselling"), in two sorted arrays: whole phrases,
+and phrases keyed from a later word. A prefix lookup binary-searches to the
+first key at or after the prefix and walks the keys that still start with
+it, whole phrases first, so "c" suggests "Campus services" before
+"Sedgewick, C128". Its cost follows the number of suggestions returned,
+not the catalogue size.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .resource_service import ResourceCard
+
+SUGGEST_KINDS = ("name", "category", "location")
+
+_WORD_START = re.compile(r"(?<![a-z0-9])[a-z0-9]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class ResourceSuggestion:
+    text: str
+    kind: str  # one of SUGGEST_KINDS
+    # Resource id for name suggestions (None for categories and locations)
+    resource_id: Optional[str]
+    # Resources carrying this text
+    count: int
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Lowercase with runs of whitespace collapsed; a trailing space is kept."""
+    return _WHITESPACE.sub(" ", prefix.lower()).lstrip()
+
+
+class _SortedKeys:
+    """Sorted (key, suggestion id) pairs, split into parallel lists for bisect."""
+
+    def __init__(self, entries: list[tuple[str, int]], suggestions: list[ResourceSuggestion]):
+        # Ties (same key) keep names before categories before locations
+        entries.sort(key=lambda entry: (entry[0], SUGGEST_KINDS.index(suggestions[entry[1]].kind), entry[1]))
+        self.keys = [key for key, _ in entries]
+        self.phrase_ids = [phrase_id for _, phrase_id in entries]
+
+    def walk(self, prefix: str):
+        """Suggestion ids whose key starts with `prefix`, in key order."""
+        keys = self.keys
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield self.phrase_ids[position]
+            position += 1
+
+
+class ResourceSuggestIndex:
+    """Word-start suffixes of each phrase, in sorted arrays (whole phrases first)."""
+
+    def __init__(self, resources: list["ResourceCard"]):
+        phrase_ids: dict[tuple[str, str], int] = {}
+        texts: list[tuple[str, str]] = []
+        resource_ids: list[Optional[str]] = []
+        counts: list[int] = []
+
+        def add(kind: str, text: str, resource_id: Optional[str]) -> None:
+            text = _WHITESPACE.sub(" ", text).strip()
+            if not text:
+                return
+            # Names stay one suggestion per resource; categories and locations merge
+            key = (kind, text if kind != "name" else f"{text}\0{resource_id}")
+            phrase_id = phrase_ids.get(key)
+            if phrase_id is None:
+                phrase_id = phrase_ids[key] = len(texts)
+                texts.append((kind, text))
+                resource_ids.append(resource_id if kind == "name" else None)
+                counts.append(0)
+            counts[phrase_id] += 1
+
+        for resource in resources:
+            add("name", resource.name, resource.id)
+            for category in dict.fromkeys(resource.categories):
+                add("category", category, None)
+            if resource.location:
+                add("location", resource.location, None)
+
+        self.suggestions = [
+            ResourceSuggestion(text=text, kind=kind, resource_id=resource_id, count=count)
+            for (kind, text), resource_id, count in zip(texts, resource_ids, counts)
+        ]
+        phrase_entries: list[tuple[str, int]] = []
+        word_entries: list[tuple[str, int]] = []
+        for phrase_id, suggestion in enumerate(self.suggestions):
+            lowered = suggestion.text.lower()
+            phrase_entries.append((lowered, phrase_id))
+            for match in _WORD_START.finditer(lowered):
+                if match.start() > 0:
+                    word_entries.append((lowered[match.start():], phrase_id))
+        self.phrases = _SortedKeys(phrase_entries, self.suggestions)
+        self.words = _SortedKeys(word_entries, self.suggestions)
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[ResourceSuggestion]:
+        """Suggestions with a word starting with `prefix`: phrase-start matches first."""
+        prefix = normalize_prefix(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        results: list[ResourceSuggestion] = []
+        seen: set[int] = set()
+        for keys in (self.phrases, self.words):
+            for phrase_id in keys.walk(prefix):
+                if phrase_id in seen:
+                    continue
+                seen.add(phrase_id)
+                results.append(self.suggestions[phrase_id])
+                if len(results) >= limit:
+                    return results
+        return results
@@ -1,30 +1,205 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
-
-# Crisis detection phrases (avoid overly broad terms to reduce false positives)
-_CRISIS_PATTERNS = [
-    r"\bsuicide\b",
-    r"\bsuicidal\b",
-    r"\bkill myself\b",
-    r"\bend my life\b",
-    r"\bwant to die\b",
-    r"\bdon't want to live\b",
-    r"\bdo not want to live\b",
-    r"\bdont want to live\b",
-    r"\bself[- ]?harm\b",
-    r"\bhurt myself\b",
-    r"\bcut myself\b",
-    r"\boverdose\b",
-    r"\bend it all\b",
-    r"\bending it all\b",
-    r"\btake my life\b",
-    r"\bwish i was dead\b",
-    r"\bcan't go on\b",
-    r"\bcant go on\b",
-    r"\bno reason to live\b",
-]
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# Crisis detection phrases by category (avoid overly broad terms to reduce
+# false positives). Phrases are written plain: spacing, apostrophes, letter
+# repeats and leetspeak variants are handled when they are compiled.
+CRISIS_PHRASES: dict[str, list[str]] = {
+    "suicidal_ideation": [
+        "suicide",
+        "suicidal",
+        "kill myself",
+        "end my life",
+        "want to die",
+        "dont want to live",
+        "do not want to live",
+        "end it all",
+        "ending it all",
+        "take my life",
+        "wish i was dead",
+        "wish i were dead",
+        "no reason to live",
+    ],
+    "self_harm": [
+        "self harm",
+        "hurt myself",
+        "cut myself",
+    ],
+    "overdose": [
+        "overdose",
+    ],
+    "hopelessness": [
+        "cant go on",
+        "cannot go on",
+    ],
+}
+
+# Category for phrases added through settings
+CUSTOM_CATEGORY = "custom"
+
+# Characters commonly substituted for letters ("k1ll", "$uicide", "0verdose")
+_LEET_VARIANTS = {
+    "a": "4@",
+    "b": "8",
+    "e": "3",
+    "g": "9",
+    "i": "1!|",
+    "l": "1|",
+    "o": "0",
+    "s": "5$",
+    "t": "7+",
+    "z": "2",
+}
+
+# Cross-script look-alikes folded to Latin before matching
+_CONFUSABLES = str.maketrans({
+    "а": "a", "е": "e", "о": "o", "р": "p", "с": "c", "у": "y", "х": "x",
+    "і": "i", "ј": "j", "ѕ": "s", "ԁ": "d", "һ": "h", "ӏ": "l",
+    "α": "a", "ε": "e", "ι": "i", "κ": "k", "ο": "o", "ρ": "p", "τ": "t", "υ": "u",
+})
+
+# Every repetition in the compiled pattern is bounded, so a failed match
+# attempt costs a fixed number of steps and a scan stays linear in the
+# message length (unbounded runs backtrack quadratically on "s s s s ...")
+# Longest run of one letter matched ("suuuuuicide")
+_MAX_LETTER_RUN = 6
+# Longest run of separator characters between two words
+_MAX_SEPARATORS = 4
+
+# Apostrophe inside a word ("don't")
+_APOSTROPHE = r"['’‘`]?"
+# Filler between the letters of a spelled-out word ("s.u.i.c.i.d.e", "k i l l").
+# Only allowed when every letter is separated, so "my self esteem" is not
+# read as "myself"
+_INTRA_WORD_SEP = r"[\s.\-_*'’‘`]"
+# Filler between words (also allows none: "killmyself"). A full stop followed
+# by whitespace ends a sentence, so "the end. It all..." is not "end it all"
+_INTER_WORD_SEP = rf"(?:[\s\-_*'’‘`]|\.(?!\s)){{0,{_MAX_SEPARATORS}}}"
+
+# "myself" may also be written "my self" / "my-self", except when "self"
+# starts a compound ("hurt my self esteem")
+_SELF_SUFFIX = "self"
+_SELF_COMPOUNDS = ("esteem", "confidence", "worth", "image", "respect", "control", "care", "doubt", "conscious")
+
+
+@dataclass(frozen=True)
+class CrisisMatch:
+    category: str
+    phrase: str
+    start: int
+    end: int
+
+
+def fold_text(text: str) -> tuple[str, Optional[list[int]]]:
+    """
+    Lowercase text and strip Unicode disguises (accents, full-width forms,
+    look-alike letters, zero-width characters).
+
+    Returns the folded text and, when it differs in length from the input,
+    the input offset of each folded character.
+    """
+    if text.isascii():
+        return text.lower(), None
+
+    chars: list[str] = []
+    offsets: list[int] = []
+    for position, char in enumerate(text):
+        for folded in unicodedata.normalize("NFKD", char):
+            if unicodedata.combining(folded) or unicodedata.category(folded) == "Cf":
+                continue
+            folded = folded.translate(_CONFUSABLES).casefold()
+            chars.append(folded)
+            offsets.extend([position] * len(folded))
+    return "".join(chars), offsets
+
+
+def _compile_word(word: str) -> str:
+    """Regex for one word, written normally or spelled out letter by letter."""
+    # Collapse repeated letters; each letter then matches one or more times
+    letters = [
+        f"[{re.escape(letter + _LEET_VARIANTS.get(letter, ''))}]{{1,{_MAX_LETTER_RUN}}}"
+        for i, letter in enumerate(word)
+        if i == 0 or letter != word[i - 1]
+    ]
+    written = _APOSTROPHE.join(letters)
+    if len(letters) == 1:
+        return written
+    # Spelled out, one repeat may be separated too ("k.i.l.l")
+    spelled = _INTRA_WORD_SEP.join(f"{letter}(?:{_INTRA_WORD_SEP}{letter})?" for letter in letters)
+    return f"(?:{written}|{spelled})"
+
+
+def _compile_phrase(phrase: str) -> str:
+    """Regex for one phrase, tolerant of separators, repeats and leetspeak."""
+    words = []
+    for word in fold_text(phrase)[0].replace("'", "").split():
+        compiled = _compile_word(word)
+        if word.endswith(_SELF_SUFFIX) and len(word) > len(_SELF_SUFFIX):
+            split = (
+                rf"{_compile_word(word[:-len(_SELF_SUFFIX)])}[\s\-_]{{1,{_MAX_SEPARATORS}}}{_compile_word(_SELF_SUFFIX)}"
+                rf"(?![\s\-_]{{0,{_MAX_SEPARATORS}}}(?:{'|'.join(_SELF_COMPOUNDS)}))"
+            )
+            compiled = f"(?:{compiled}|{split})"
+        words.append(compiled)
+    return _INTER_WORD_SEP.join(words)
+
+
+class SafetyEngine:
+    """
+    Crisis phrase detector compiled into a single regex alternation.
+
+    One pass over the folded text finds every phrase, whatever the number of
+    phrases compiled in. Matches report the category and the span in the
+    original (unfolded) text.
+    """
+
+    def __init__(self, extra_phrases: Iterable[str] = ()):
+        self._phrases: list[tuple[str, str]] = [
+            (category, phrase) for category, phrases in CRISIS_PHRASES.items() for phrase in phrases
+        ]
+        self._phrases.extend((CUSTOM_CATEGORY, phrase) for phrase in extra_phrases if phrase.strip())
+        alternation = "|".join(
+            f"(?P<p{n}>{_compile_phrase(phrase)})" for n, (_, phrase) in enumerate(self._phrases)
+        )
+        self._pattern = re.compile(f"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])")
+
+    def detect(self, text: Optional[str]) -> bool:
+        """True if any crisis phrase appears in the text."""
+        if not text:
+            return False
+        return self._pattern.search(fold_text(text)[0]) is not None
+
+    def scan(self, text: Optional[str]) -> list[CrisisMatch]:
+        """Every crisis phrase in the text, with its category and span."""
+        if not text:
+            return []
+        folded, offsets = fold_text(text)
+        matches = []
+        for match in self._pattern.finditer(folded):
+            category, phrase = self._phrases[int(match.lastgroup[1:])]
+            start, end = match.span()
+            if offsets is not None:
+                start, end = offsets[start], offsets[end - 1] + 1
+            matches.append(CrisisMatch(category=category, phrase=phrase, start=start, end=end))
+        return matches
+
+
+_safety_engine: Optional[SafetyEngine] = None
+
+
+def get_safety_engine() -> SafetyEngine:
+    """Get or create the shared safety engine (includes CRISIS_EXTRA_PHRASES)."""
+    global _safety_engine
+    if _safety_engine is None:
+        from ..config import settings
+
+        _safety_engine = SafetyEngine(settings.crisis_extra_phrases)
+    return _safety_engine
+
 
 _CRISIS_RESOURCE_LINES = [
     "Call or text 988 (Suicide Crisis Helpline, Canada, 24/7)",
@@ -40,10 +215,106 @@ _EMERGENCY_LINE = "If you're in immediate danger, call 911."
 
 
 def detect_crisis(text: Optional[str]) -> bool:
-    if not text:
-        return False
-    lower = text.lower()
-    return any(re.search(pattern, lower) for pattern in _CRISIS_PATTERNS)
+    return get_safety_engine().detect(text)
+
+
+def scan_crisis(text: Optional[str]) -> list[CrisisMatch]:
+    return get_safety_engine().scan(text)
+
+
+# Medication amounts the companion must never state ("take 500 mg", "20 pills")
+_DOSAGE_PATTERN = re.compile(
+    r"\b\d{1,5}(?:[.,]\d{1,3})?[ \t-]{0,2}"
+    r"(?:mg|mcg|µg|milligrams?|micrograms?|pills?|tablets?|capsules?)\b",
+    re.IGNORECASE,
+)
+
+# Any of these means the reply already points at crisis support
+_CRISIS_RESOURCE_PATTERN = re.compile(r"\b988\b|1-800-784-2433|findahelpline|\b911\b")
+
+# Text held back from the client so a match split across chunks can still be
+# stopped; longer than any _DOSAGE_PATTERN or _CRISIS_RESOURCE_PATTERN match
+_SCAN_WINDOW = 32
+
+_MEDICATION_NOTICE = (
+    "I can't give advice about medication doses. A pharmacist, your doctor, or the "
+    "UVic Student Wellness Centre can help with that safely."
+)
+
+
+@dataclass(frozen=True)
+class OutputViolation:
+    category: str
+    excerpt: str
+
+
+class StreamingSafetyScanner:
+    """
+    Incremental safety check over model output chunks.
+
+    Each chunk is scanned together with the short held-back window before it,
+    so per-chunk work does not grow with the length of the reply. Text is
+    released only once no match can still start inside it. After a
+    violation nothing more is released; `cutover_text` gives the reply to
+    send instead.
+
+    With `require_crisis_resources` (the turn after a crisis message),
+    `finish` appends the crisis resources if the reply never mentioned them.
+    """
+
+    def __init__(self, require_crisis_resources: bool = False, preferred_name: Optional[str] = None):
+        self.require_crisis_resources = require_crisis_resources
+        self.preferred_name = preferred_name
+        self.violation: Optional[OutputViolation] = None
+        self._resources_seen = False
+        # Released text kept only as lookbehind context for the next scan
+        self._context = ""
+        self._pending = ""
+
+    def _scan(self, text: str) -> None:
+        match = _DOSAGE_PATTERN.search(text)
+        if match:
+            self.violation = OutputViolation(category="medication_dosage", excerpt=match.group(0))
+        if not self._resources_seen and _CRISIS_RESOURCE_PATTERN.search(text):
+            self._resources_seen = True
+
+    def feed(self, chunk: str) -> str:
+        """Scan a chunk; return the text that is now safe to send."""
+        if self.violation:
+            return ""
+        self._pending += chunk
+        self._scan(self._context + self._pending)
+        if self.violation or len(self._pending) <= _SCAN_WINDOW:
+            return ""
+        released = self._pending[:-_SCAN_WINDOW]
+        self._pending = self._pending[-_SCAN_WINDOW:]
+        self._context = released[-_SCAN_WINDOW:]
+        return released
+
+    def finish(self) -> str:
+        """Release the held-back text at the end of the reply."""
+        if self.violation:
+            return ""
+        released, self._pending = self._pending, ""
+        if self.require_crisis_resources and not self._resources_seen:
+            released += f"\n\n{build_crisis_resources_block()}"
+            self._resources_seen = True
+        return released
+
+    def cutover_text(self) -> str:
+        """Reply to send in place of the rest of a flagged response."""
+        if self.require_crisis_resources:
+            return build_crisis_response(self.preferred_name)
+        return _MEDICATION_NOTICE
+
+
+def screen_reply(text: str, require_crisis_resources: bool = False, preferred_name: Optional[str] = None) -> str:
+    """Run a complete (non-streamed) reply through `StreamingSafetyScanner`."""
+    scanner = StreamingSafetyScanner(require_crisis_resources, preferred_name)
+    released = scanner.feed(text)
+    if scanner.violation:
+        return scanner.cutover_text()
+    return released + scanner.finish()
 
 
 def get_crisis_resource_lines(include_emergency: bool = True) -> list[str]:
@@ -58,20 +329,35 @@ def get_crisis_action_steps() -> list[str]:
     return list(_CRISIS_ACTION_STEPS)
 
 
-def build_crisis_resources_block(include_emergency: bool = True) -> str:
+def _format_resources_block(include_emergency: bool) -> str:
     lines = get_crisis_resource_lines(include_emergency=include_emergency)
     return "\n".join([f"• {line}" for line in lines])
 
 
+# Crisis texts are fixed, so they are built once rather than per response
+_CRISIS_RESOURCES_BLOCKS = {flag: _format_resources_block(flag) for flag in (True, False)}
+
+_CRISIS_RESPONSE_BODY = (
+    "I can hear how much pain you're in, and I want to make sure you're safe. "
+    "I'm an AI, and I can't provide the level of care you deserve right now.\n\n"
+    f"{_CRISIS_RESOURCES_BLOCKS[True]}\n\n"
+    "I'm still here with you. Would you like to stay here while you reach out?"
+)
+
+_CRISIS_CHECKIN_MESSAGE = (
+    "I'm still here with you. If things feel unsafe right now, please reach out for support.\n\n"
+    f"{_CRISIS_RESOURCES_BLOCKS[True]}"
+)
+
+
+def build_crisis_resources_block(include_emergency: bool = True) -> str:
+    return _CRISIS_RESOURCES_BLOCKS[include_emergency]
+
+
 def build_crisis_response(preferred_name: Optional[str] = None) -> str:
-    name_prefix = f"{preferred_name}, " if preferred_name else ""
-    resources_block = build_crisis_resources_block()
-    return (
-        f"{name_prefix}I can hear how much pain you're in, and I want to make sure you're safe. "
-        "I'm an AI, and I can't provide the level of care you deserve right now.\n\n"
-        f"{resources_block}\n\n"
-        "I'm still here with you. Would you like to stay here while you reach out?"
-    )
+    if preferred_name:
+        return f"{preferred_name}, {_CRISIS_RESPONSE_BODY}"
+    return _CRISIS_RESPONSE_BODY
 
 
 def build_crisis_follow_up_question() -> str:
@@ -79,8 +365,4 @@ def build_crisis_follow_up_question() -> str:
 
 
 def build_crisis_checkin_message() -> str:
-    resources_block = build_crisis_resources_block()
-    return (
-        "I'm still here with you. If things feel unsafe right now, please reach out for support.\n\n"
-        f"{resources_block}"
-    )
+    return _CRISIS_CHECKIN_MESSAGE
@@ -0,0 +1,389 @@
+"""
+Session stores for chat state.
+
+Holds conversation history, profile and memory per session with bounded
+size: LRU eviction past `max_sessions` or `max_total_bytes`, and idle-TTL
+expiry. `MemorySessionStore` is per-process; `SqliteSessionStore` is shared
+by every worker pointed at the same database file.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# A read refreshes a SQLite session's last_used only once it is this stale,
+# so most reads do not write (LRU order and TTL are accurate to this much)
+SQLITE_TOUCH_INTERVAL_SECONDS = 60.0
+
+# How often a worker sweeps expired SQLite sessions; get() expires a stale
+# session on its own in between
+SQLITE_SWEEP_INTERVAL_SECONDS = 30.0
+
+
+@dataclass
+class SessionState:
+    history: list[dict] = field(default_factory=list)
+    profile: dict = field(default_factory=dict)
+    memory: dict = field(default_factory=dict)
+    # Bumped on every recorded exchange so pooled chats can detect stale history
+    revision: int = 0
+    # Set by a crisis message; the next reply must carry crisis resources
+    crisis_followup: bool = False
+
+
+def estimate_session_bytes(state: SessionState) -> int:
+    """Approximate payload size of a session (UTF-8 text only)."""
+    total = 0
+    for entry in state.history:
+        for part in entry.get("parts", []):
+            total += len(str(part).encode("utf-8"))
+    for values in (state.profile, state.memory):
+        for key, value in values.items():
+            total += len(key) + len(str(value).encode("utf-8"))
+    return total
+
+
+class SessionBackend(ABC):
+    """Interface shared by all session stores."""
+
+    on_evict: Optional[Callable[[str], None]] = None
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Return the session state, or None if unknown or expired."""
+
+    @abstractmethod
+    def save(self, session_id: str, state: SessionState) -> None:
+        """Store (or re-account) a session after it has been modified."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Session counts, byte totals and eviction counters."""
+
+    def _notify(self, session_ids: list[str]) -> None:
+        if self.on_evict:
+            for session_id in session_ids:
+                self.on_evict(session_id)
+
+
+class MemorySessionStore(SessionBackend):
+    """In-process session store with LRU/TTL eviction and byte accounting."""
+
+    def __init__(
+        self,
+        max_sessions: int = 5000,
+        ttl_seconds: float = 3600,
+        max_total_bytes: int = 64 * 1024 * 1024,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_total_bytes = max_total_bytes
+        self.on_evict = on_evict
+        # session_id -> (state, size_bytes, last_used)
+        self._entries: OrderedDict[str, tuple[SessionState, int, float]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        now = time.monotonic()
+        evicted: list[str] = []
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            state, size, last_used = entry
+            if now - last_used > self.ttl_seconds:
+                self._remove_locked(session_id)
+                self._evicted_ttl += 1
+                evicted.append(session_id)
+                state = None
+            else:
+                self._entries[session_id] = (state, size, now)
+                self._entries.move_to_end(session_id)
+        self._notify(evicted)
+        return state
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        now = time.monotonic()
+        size = estimate_session_bytes(state)
+        with self._lock:
+            previous = self._entries.get(session_id)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[session_id] = (state, size, now)
+            self._entries.move_to_end(session_id)
+            self._total_bytes += size
+            evicted = self._evict_locked(now, keep=session_id)
+        self._notify(evicted)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._remove_locked(session_id)
+
+    def _remove_locked(self, session_id: str) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry[1]
+        return True
+
+    def _evict_locked(self, now: float, keep: str) -> list[str]:
+        evicted: list[str] = []
+        # Least recently used sessions sit at the front.
+        while self._entries:
+            session_id, (_, _, last_used) = next(iter(self._entries.items()))
+            if session_id == keep:
+                break
+            if now - last_used > self.ttl_seconds:
+                self._evicted_ttl += 1
+            elif len(self._entries) > self.max_sessions or self._total_bytes > self.max_total_bytes:
+                self._evicted_lru += 1
+            else:
+                break
+            self._remove_locked(session_id)
+            evicted.append(session_id)
+        return evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [size for _, size, _ in self._entries.values()]
+            return {
+                "backend": "memory",
+                "sessions": len(self._entries),
+                "max_sessions": self.max_sessions,
+                "total_bytes": self._total_bytes,
+                "max_total_bytes": self.max_total_bytes,
+                "largest_session_bytes": max(sizes, default=0),
+                "evicted_lru": self._evicted_lru,
+                "evicted_ttl": self._evicted_ttl,
+            }
+
+
+class SqliteSessionStore(SessionBackend):
+    """
+    Session store backed by a SQLite database in WAL mode.
+
+    Every uvicorn worker opens its own connection to the same file, so a
+    session's history survives requests landing on different workers.
+    Session count and byte totals live in a one-row table kept current by
+    triggers, so the limit check on save reads one row rather than
+    aggregating the table. Eviction counters are per-process.
+
+    Calls block on disk I/O (and on SQLite's busy timeout when another
+    worker holds the write lock); async code should call them through
+    `asyncio.to_thread`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_sessions: int = 5000,
+        ttl_seconds: float = 3600,
+        max_total_bytes: int = 64 * 1024 * 1024,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_total_bytes = max_total_bytes
+        self.on_evict = on_evict
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+        self._last_sweep = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Reconnect after fork: SQLite connections must not cross processes.
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_sessions ("
+                "session_id TEXT PRIMARY KEY, "
+                "data TEXT NOT NULL, "
+                "size_bytes INTEGER NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_used ON chat_sessions (last_used)"
+            )
+            self._create_totals(conn)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            logger.info("Session store opened at %s", self.path)
+        return self._conn
+
+    @staticmethod
+    def _create_totals(conn: sqlite3.Connection) -> None:
+        """Create the totals row and its triggers, seeded from existing sessions."""
+        # One transaction, so a database created by an older version is
+        # seeded exactly once even with several workers starting together
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_session_totals ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "sessions INTEGER NOT NULL, "
+                "total_bytes INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO chat_session_totals (id, sessions, total_bytes) "
+                "SELECT 0, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM chat_sessions"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS chat_sessions_insert AFTER INSERT ON chat_sessions BEGIN "
+                "UPDATE chat_session_totals SET sessions = sessions + 1, "
+                "total_bytes = total_bytes + NEW.size_bytes WHERE id = 0; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS chat_sessions_delete AFTER DELETE ON chat_sessions BEGIN "
+                "UPDATE chat_session_totals SET sessions = sessions - 1, "
+                "total_bytes = total_bytes - OLD.size_bytes WHERE id = 0; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS chat_sessions_resize AFTER UPDATE OF size_bytes ON chat_sessions BEGIN "
+                "UPDATE chat_session_totals SET total_bytes = total_bytes - OLD.size_bytes + NEW.size_bytes "
+                "WHERE id = 0; END"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        now = time.time()
+        evicted: list[str] = []
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT data, last_used FROM chat_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            data, last_used = row
+            if now - last_used > self.ttl_seconds:
+                conn.execute("DELETE FROM chat_sessions WHERE session_id = ?", (session_id,))
+                self._evicted_ttl += 1
+                evicted.append(session_id)
+                state = None
+            else:
+                if now - last_used > SQLITE_TOUCH_INTERVAL_SECONDS:
+                    conn.execute(
+                        "UPDATE chat_sessions SET last_used = ? WHERE session_id = ?",
+                        (now, session_id),
+                    )
+                state = SessionState(**json.loads(data))
+        self._notify(evicted)
+        return state
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        now = time.time()
+        size = estimate_session_bytes(state)
+        with self._lock:
+            conn = self._connection()
+            # An upsert, not INSERT OR REPLACE: REPLACE deletes the old row
+            # without firing the delete trigger that keeps the totals
+            conn.execute(
+                "INSERT INTO chat_sessions (session_id, data, size_bytes, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET "
+                "data = excluded.data, size_bytes = excluded.size_bytes, last_used = excluded.last_used",
+                (session_id, json.dumps(asdict(state)), size, now),
+            )
+            evicted = self._evict_locked(conn, now, keep=session_id)
+        self._notify(evicted)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM chat_sessions WHERE session_id = ?", (session_id,)
+            )
+            return cursor.rowcount > 0
+
+    def _evict_locked(self, conn: sqlite3.Connection, now: float, keep: str) -> list[str]:
+        expired: list[str] = []
+        if now - self._last_sweep >= SQLITE_SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = now
+            expired = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT session_id FROM chat_sessions WHERE last_used < ? AND session_id != ?",
+                    (now - self.ttl_seconds, keep),
+                )
+            ]
+            if expired:
+                conn.executemany("DELETE FROM chat_sessions WHERE session_id = ?", [(sid,) for sid in expired])
+                self._evicted_ttl += len(expired)
+
+        count, total_bytes = conn.execute(
+            "SELECT sessions, total_bytes FROM chat_session_totals WHERE id = 0"
+        ).fetchone()
+        if count <= self.max_sessions and total_bytes <= self.max_total_bytes:
+            return expired
+
+        # Oldest first through the last_used index; stop once under the limits
+        evicted_lru: list[str] = []
+        oldest = conn.execute(
+            "SELECT session_id, size_bytes FROM chat_sessions WHERE session_id != ? ORDER BY last_used",
+            (keep,),
+        )
+        for session_id, size in oldest:
+            if count <= self.max_sessions and total_bytes <= self.max_total_bytes:
+                break
+            evicted_lru.append(session_id)
+            count -= 1
+            total_bytes -= size
+        oldest.close()
+        conn.executemany("DELETE FROM chat_sessions WHERE session_id = ?", [(sid,) for sid in evicted_lru])
+        self._evicted_lru += len(evicted_lru)
+        return expired + evicted_lru
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connection()
+            count, total_bytes = conn.execute(
+                "SELECT sessions, total_bytes FROM chat_session_totals WHERE id = 0"
+            ).fetchone()
+            (largest,) = conn.execute("SELECT COALESCE(MAX(size_bytes), 0) FROM chat_sessions").fetchone()
+            return {
+                "backend": "sqlite",
+                "sessions": count,
+                "max_sessions": self.max_sessions,
+                "total_bytes": total_bytes,
+                "max_total_bytes": self.max_total_bytes,
+                "largest_session_bytes": largest,
+                "evicted_lru": self._evicted_lru,
+                "evicted_ttl": self._evicted_ttl,
+            }
+
+
+def create_session_store(
+    backend: str,
+    sqlite_path: str = "sessions.db",
+    **kwargs,
+) -> SessionBackend:
+    """Build the configured session store ("memory" or "sqlite")."""
+    if backend == "sqlite":
+        return SqliteSessionStore(sqlite_path, **kwargs)
+    if backend != "memory":
+        logger.warning("Unknown session backend %r, using in-memory store", backend)
+    return MemorySessionStore(**kwargs)
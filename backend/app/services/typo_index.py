@@ -0,0 +1,204 @@
+"""
+Typo-tolerant word lookup.
+
+A character-trigram index over a fixed vocabulary proposes candidates for a
+misspelled word; a single-typo check (`is_typo_edit`) verifies them. Used
+to recover intent matches for messages like "so overwhlemed" or "my anxeity
+is bad".
+
+Real words outside the dataset vocabulary must not be "corrected" into
+different ones ("tired" -> "tried", "fill" -> "kill", "putting" ->
+"cutting"). A correction is therefore accepted only when it is one
+keyboard-typo edit away (`is_typo_edit`), leaves the first letter alone,
+and is the only such vocabulary word; common English words are never
+corrected.
+"""
+
+from typing import Iterable, Optional
+
+# Words shorter than this are never corrected (too ambiguous)
+MIN_CORRECTABLE_LENGTH = 4
+
+# Substitutions and dropped or extra letters (other than doubled ones) are
+# only typos in words at least this long; in shorter words they usually
+# spell another real word ("lake"/"like", "fund"/"find", "quiet"/"quit")
+MIN_EDIT_LENGTH = 6
+
+_VOWELS = frozenset("aeiouy")
+
+_KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+
+def _neighbour_keys() -> dict[str, frozenset[str]]:
+    """Letters next to each other on a QWERTY keyboard, within and across rows."""
+    neighbours: dict[str, frozenset[str]] = {}
+    for row_index, row in enumerate(_KEYBOARD_ROWS):
+        for column, key in enumerate(row):
+            nearby = {
+                other
+                for other_row in _KEYBOARD_ROWS[max(row_index - 1, 0):row_index + 2]
+                for other in other_row[max(column - 1, 0):column + 2]
+            }
+            neighbours[key] = frozenset(nearby - {key})
+    return neighbours
+
+
+_NEIGHBOUR_KEYS = _neighbour_keys()
+
+# Corrections remembered per index (message words repeat a lot)
+MAX_CACHED_CORRECTIONS = 4096
+
+# Correctly spelled words that are often missing from the dataset vocabulary
+# and sit one edit away from a different vocabulary word
+COMMON_WORDS = frozenset("""
+    able about above ache ached aches after again alive alone along also always angry ankle anyone
+    anything anyway apart asked asleep awake aware awful badly bake baked band bare bear beat bed
+    bedroom beer bent best bike bills bite bitter blame bled bleed blind blood blue board boat body boil
+    bold bone bored boring born boss both bowl brain brave bread break broke broken brother brush build
+    built burn burned burnt busy cake calm came card care cared careful cares cash cast cat cell chat
+    chest chill chore class clean clear close cloth cloud club coat code coffee cold come cook cool cope
+    cost cough could crash crazy cried cries cry cute dad damn dark date dead deal dear debt decode deep
+    desk died dies diet dog done door down drag draw dream dress drink drive drop drug drunk dull dumb
+    dust duty each ease easy eat eaten else empty ended ends enough even ever every exam face fail fair
+    fake fall fast fat fear feed feel feels fell felt fever few fight file fine fire firm fish fit five
+    flat flu fly food fool foot form free fresh from front full fun game gave gift girl give glad goal
+    gone good grade grew gross grow guess guilt guy hair half hand hang happy hard hate have head heal
+    hear heart heat held hell help here hide high hill hold hole home hope hot hour house huge hung
+    hunger hungry hurt idea ill interior itch itchy job joke jump just keep kept kid kind knee knew know
+    lack lame land last late lazy lead leading lean left less lie life lift like line list live lively
+    load lock long look lose loss lost loud love low luck lunch mad made mail make male mark mass mate
+    meal mean meant meet mess met mind mine miss mom mood more most move much must nap near neck need
+    nerd nice nine none nose note numb odd okay old once only open over paid pain pale park part pass
+    past path pay peace pick pile pink plan play poor pray prom proud pull push quit race rage rain ran
+    rank rare rate read real rent rest rich ride ring rise risk road rock role room rude rule run rush
+    sad safe said sale same sane save scar scary scored scores seat seem seen self sell send sent shame
+    shy sick side sigh sign silly sing sink sit size skin skip sleep slept slow small smell snow soft
+    sold some song soon sore sorry sort soul sour spent spot star stay staying step stiff still stop
+    store storm story stuck stuff suck sure swim take talk tall task team tear tell tend tense test text
+    than that them then they thin this three tied tight till time tiny tips tire tired told tone took
+    tore torn tour town tried tries trip true try turn twin type ugly unfair upset used user vent very
+    view vote wait wake walk wall want warm wash weak wear week weird well went were what when whole
+    wide wife wild will wind wine wise wish with woke word wore work worn worry worse worst wrap year
+    yell
+""".split())
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def is_typo_edit(word: str, candidate: str) -> bool:
+    """
+    True if `word` looks like `candidate` with one keyboard typo: two
+    adjacent letters swapped ("freinds"), a doubled letter added or dropped
+    ("scaredd", "hopeles"), a vowel for a vowel or a neighbouring key
+    ("suicidel") or a letter dropped or added mid-word ("stresed"), the last
+    two only in longer words. The first letter is never part of the typo,
+    and endings ("cuts"/"cut", "creates"/"created") are left to the
+    vocabulary.
+    """
+    if not word or not candidate or word[0] != candidate[0]:
+        return False
+    if len(word) == len(candidate):
+        diffs = [i for i, (x, y) in enumerate(zip(word, candidate)) if x != y]
+        if len(diffs) == 1:
+            if len(word) < MIN_EDIT_LENGTH or diffs[0] == len(word) - 1:
+                return False
+            a, b = word[diffs[0]], candidate[diffs[0]]
+            return (a in _VOWELS and b in _VOWELS) or b in _NEIGHBOUR_KEYS.get(a, ())
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and word[diffs[0]] == candidate[diffs[1]]
+            and word[diffs[1]] == candidate[diffs[0]]
+        )
+    if abs(len(word) - len(candidate)) != 1:
+        return False
+    longer, shorter = (word, candidate) if len(word) > len(candidate) else (candidate, word)
+    for i in range(1, len(longer)):
+        if longer[:i] + longer[i + 1:] != shorter:
+            continue
+        if longer[i] == longer[i - 1] or (i + 1 < len(longer) and longer[i] == longer[i + 1]):
+            return True
+        if len(word) >= MIN_EDIT_LENGTH and i < len(longer) - 1:
+            return True
+    return False
+
+
+class TrigramIndex:
+    """Trigram posting lists over a vocabulary, for single-typo corrections."""
+
+    def __init__(self, words: Iterable[str], protected: Iterable[str] = ()):
+        self.frequency: dict[str, int] = {}
+        for word in words:
+            self.frequency[word] = self.frequency.get(word, 0) + 1
+        self.words: list[str] = sorted(self.frequency)
+        # "cant" -> "can't": apostrophes are the most common omission
+        self.without_apostrophes: dict[str, str] = {
+            word.replace("'", ""): word for word in self.words if "'" in word
+        }
+        # Vocabulary words a correction may never produce
+        self.protected = frozenset(protected)
+        self.postings: dict[str, list[int]] = {}
+        for word_id, word in enumerate(self.words):
+            for gram in _trigrams(word):
+                self.postings.setdefault(gram, []).append(word_id)
+        self._corrections: dict[str, Optional[str]] = {}
+
+    def __getstate__(self) -> dict:
+        # The correction memo is runtime state; don't persist it in artifacts
+        state = self.__dict__.copy()
+        state["_corrections"] = {}
+        return state
+
+    def correct_word(self, word: str) -> Optional[str]:
+        """The one vocabulary word a single typo away, or None."""
+        if word in self.frequency or len(word) < MIN_CORRECTABLE_LENGTH or not word.isalpha():
+            return None
+        if word in self.without_apostrophes:
+            return self.without_apostrophes[word]
+        if word in COMMON_WORDS:
+            return None
+        try:
+            return self._corrections[word]
+        except KeyError:
+            pass
+        correction = self._closest(word)
+        if len(self._corrections) >= MAX_CACHED_CORRECTIONS:
+            self._corrections.clear()
+        self._corrections[word] = correction
+        return correction
+
+    def _closest(self, word: str) -> Optional[str]:
+        grams = _trigrams(word)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for word_id in self.postings.get(gram, ()):
+                shared[word_id] = shared.get(word_id, 0) + 1
+
+        # One edit (or transposition) disturbs at most 4 trigrams, so a
+        # candidate a typo away shares at least len - 4 of them
+        found: Optional[str] = None
+        for word_id, count in shared.items():
+            candidate = self.words[word_id]
+            if count < len(grams) - 4 or count < len(candidate) - 4:
+                continue
+            if not is_typo_edit(word, candidate):
+                continue
+            if found is not None:
+                # Two vocabulary words fit the same typo: don't guess
+                return None
+            found = candidate
+        return None if found in self.protected else found
+
+    def correct_text(self, normalized_text: str) -> Optional[str]:
+        """Text with misspelled words replaced, or None if nothing changed."""
+        words = normalized_text.split()
+        changed = False
+        for i, word in enumerate(words):
+            replacement = self.correct_word(word)
+            if replacement:
+                words[i] = replacement
+                changed = True
+        return " ".join(words) if changed else None
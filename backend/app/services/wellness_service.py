@@ -13,14 +13,9 @@ from ..models.schemas import (
     WellnessCheckInResponse,
     ResourceCardOut,
 )
-from .safety import (
-    detect_crisis,
-    get_crisis_action_steps,
-    get_crisis_resource_lines,
-    build_crisis_follow_up_question,
-    build_crisis_checkin_message,
-)
-from .resource_service import get_resource_service, build_resource_id
+from .crisis_bundle import get_crisis_bundle
+from .message_analysis import MessageAnalysis, analyze_message
+from .resource_service import get_resource_service
 from .seasonal_service import seasonal_service
 
 # Configure Google Gemini (safe to call multiple times)
@@ -97,27 +92,6 @@ def _dedupe(items: list[str]) -> list[str]:
     return unique
 
 
-def _is_academic_note(note: Optional[str]) -> bool:
-    if not note:
-        return False
-    lowered = note.lower()
-    return any(term in lowered for term in ["exam", "midterm", "assignment", "paper", "deadline", "grade", "class"])
-
-
-def _is_lonely_note(note: Optional[str]) -> bool:
-    if not note:
-        return False
-    lowered = note.lower()
-    return any(term in lowered for term in ["lonely", "alone", "isolated", "homesick", "no friends", "friendless"])
-
-
-def _is_anxious_note(note: Optional[str]) -> bool:
-    if not note:
-        return False
-    lowered = note.lower()
-    return any(term in lowered for term in ["anxious", "anxiety", "panic", "worried", "nervous", "on edge"])
-
-
 def _seasonal_suggestions(weather: Optional[WeatherContext]) -> list[str]:
     if not weather:
         return []
@@ -132,7 +106,7 @@ def _seasonal_suggestions(weather: Optional[WeatherContext]) -> list[str]:
 
 def _deterministic_suggestions(
     mood: MoodLevel,
-    note: Optional[str],
+    analysis: MessageAnalysis,
     weather: Optional[WeatherContext],
 ) -> list[str]:
     suggestions: list[str] = []
@@ -157,11 +131,11 @@ def _deterministic_suggestions(
             "Consider reaching out to Student Wellness or UVic Counselling.",
         ])
 
-    if _is_academic_note(note):
+    if "academic" in analysis.note_categories:
         suggestions.append("If academics are heavy, the Academic Skills Centre can help you plan.")
-    if _is_lonely_note(note):
+    if "lonely" in analysis.note_categories:
         suggestions.append("Low-pressure connection idea: drop into UVic Global Community or a club page.")
-    if _is_anxious_note(note):
+    if "anxious" in analysis.note_categories:
         suggestions.append("Try a 2-minute box breath: 4 in, 4 hold, 4 out, 4 hold.")
 
     return _dedupe(suggestions)[:5]
@@ -190,12 +164,7 @@ def _fallback_suggestions(mood: MoodLevel, weather: Optional[WeatherContext]) ->
 
 
 def _crisis_suggestions() -> WellnessSuggestionResponse:
-    suggestions = get_crisis_action_steps() + get_crisis_resource_lines()
-    return WellnessSuggestionResponse(
-        suggestions=suggestions[:5],
-        follow_up_question=build_crisis_follow_up_question(),
-        resources=[],
-    )
+    return get_crisis_bundle().wellness_suggestions.model_copy(deep=True)
 
 
 def _fallback_checklist(weather: Optional[WeatherContext]) -> WellnessChecklistResponse:
@@ -216,8 +185,7 @@ def _fallback_checklist(weather: Optional[WeatherContext]) -> WellnessChecklistR
 
 
 def _crisis_checklist() -> WellnessChecklistResponse:
-    items = get_crisis_action_steps() + get_crisis_resource_lines()
-    return WellnessChecklistResponse(title="Immediate support steps", items=items[:6])
+    return get_crisis_bundle().wellness_checklist.model_copy(deep=True)
 
 
 def _fallback_checkin() -> WellnessCheckInResponse:
@@ -227,12 +195,12 @@ def _fallback_checkin() -> WellnessCheckInResponse:
 
 
 def _crisis_checkin() -> WellnessCheckInResponse:
-    return WellnessCheckInResponse(message=build_crisis_checkin_message())
+    return get_crisis_bundle().wellness_checkin.model_copy(deep=True)
 
 
-def _contains_crisis(*values: Optional[str]) -> bool:
+def contains_crisis(*values: Optional[str]) -> bool:
     combined = " ".join([value for value in values if value])
-    return detect_crisis(combined)
+    return analyze_message(combined).is_crisis
 
 
 class WellnessService:
@@ -316,24 +284,25 @@ class WellnessService:
         weather: Optional[WeatherContext] = None,
     ) -> WellnessSuggestionResponse:
         """Generate weather-aware, UVic-specific suggestions."""
-        if _contains_crisis(note):
+        analysis = analyze_message(note)
+        if analysis.is_crisis:
             return _crisis_suggestions()
 
-        suggestions = _deterministic_suggestions(mood, note, weather)
+        suggestions = _deterministic_suggestions(mood, analysis, weather)
         follow_up = (
             "Want me to create a gentle checklist for the next few hours?"
             if mood in {MoodLevel.LOW, MoodLevel.STRUGGLING}
             else "Want me to turn these into a quick checklist?"
         )
 
-        resources = self._select_resources(mood, note)
+        resources = self._select_resources(mood, analysis)
         return WellnessSuggestionResponse(
             suggestions=suggestions,
             follow_up_question=follow_up,
             resources=resources,
         )
 
-    def _select_resources(self, mood: MoodLevel, note: Optional[str]) -> list[ResourceCardOut]:
+    def _select_resources(self, mood: MoodLevel, analysis: MessageAnalysis) -> list[ResourceCardOut]:
         if not self.resource_service.is_loaded:
             return []
 
@@ -343,11 +312,11 @@ class WellnessService:
         if mood == MoodLevel.OKAY:
             queries.append("Student Wellness Centre")
 
-        if _is_academic_note(note):
+        if "academic" in analysis.note_categories:
             queries.append("Academic Skills Centre")
-        if _is_lonely_note(note):
+        if "lonely" in analysis.note_categories:
             queries.extend(["UVic Global Community", "clubs", "UVSS"])
-        if _is_anxious_note(note):
+        if "anxious" in analysis.note_categories:
             queries.append("Multifaith Centre")
         if mood in {MoodLevel.GREAT, MoodLevel.GOOD}:
             queries.extend(["CARSA", "Vikes Sport Clubs"])
@@ -355,18 +324,7 @@ class WellnessService:
         if not queries:
             queries = ["Student Wellness Centre", "UVic Counselling"]
 
-        results: list[ResourceCardOut] = []
-        seen_ids: set[str] = set()
-        for query in queries:
-            for item in self.resource_service.search(query, limit=2):
-                resource_id = item.get("id") or build_resource_id(item.get("name", ""))
-                if resource_id in seen_ids:
-                    continue
-                seen_ids.add(resource_id)
-                results.append(ResourceCardOut(**{**item, "id": resource_id}))
-                if len(results) >= 4:
-                    return results
-        return results
+        return self.resource_service.search_many(queries, per_query_limit=2, total_limit=4)
 
     async def generate_checklist(
         self,
@@ -377,7 +335,7 @@ class WellnessService:
         max_items: int = 5,
     ) -> WellnessChecklistResponse:
         """Generate a checklist via Gemini Flash."""
-        if _contains_crisis(note, " ".join(suggestions or [])):
+        if contains_crisis(note, " ".join(suggestions or [])):
             return _crisis_checklist()
 
         if not settings.google_ai_api_key:
@@ -399,7 +357,7 @@ class WellnessService:
                 model_name=GEMINI_MODEL_NAME,
                 system_instruction=CHECKLIST_SYSTEM_PROMPT,
             )
-            response = model.generate_content(
+            response = await model.generate_content_async(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     max_output_tokens=512,
@@ -432,7 +390,7 @@ class WellnessService:
         checklist_summary: Optional[str] = None,
     ) -> WellnessCheckInResponse:
         """Generate a follow-up check-in after checklist completion."""
-        if _contains_crisis(note, checklist_summary):
+        if contains_crisis(note, checklist_summary):
             return _crisis_checkin()
 
         if not settings.google_ai_api_key:
@@ -452,7 +410,7 @@ class WellnessService:
                 model_name=GEMINI_MODEL_NAME,
                 system_instruction=CHECKIN_SYSTEM_PROMPT,
             )
-            response = model.generate_content(
+            response = await model.generate_content_async(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     max_output_tokens=256,
@@ -0,0 +1,117 @@
+"""
+Chat concurrency benchmark.
+
+Drives POST /api/chat in-process with a simulated Gemini backend that takes
+a fixed latency per reply, and reports requests/second as concurrency grows.
+The "blocking" scenario reproduces the old handler, which called the
+synchronous SDK method from inside the event loop.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chat_concurrency --latency 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from unittest import mock
+
+import httpx
+
+from app.config import settings
+from app.main import app
+from app.models.schemas import ChatMode
+from app.services import chat_service
+from app.services.chat_service import ChatService
+
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeChat:
+    def __init__(self, latency: float, history=None):
+        self.latency = latency
+        # ChatService reads and trims the chat's history after each turn
+        self.history = list(history or [])
+
+    def _reply(self, message) -> _FakeResponse:
+        reply = f"echo: {message}"
+        self.history.append({"role": "user", "parts": [message]})
+        self.history.append({"role": "model", "parts": [reply]})
+        return _FakeResponse(reply)
+
+    def send_message(self, message, **kwargs):
+        time.sleep(self.latency)
+        return self._reply(message)
+
+    async def send_message_async(self, message, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._reply(message)
+
+
+class _FakeModel:
+    latency = 0.2
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start_chat(self, history=None):
+        return _FakeChat(self.latency, history)
+
+
+async def _blocking_response(cls, message, mode, session_id=None, **kwargs):
+    return ChatService.get_contextual_response(message=message, mode=mode, session_id=session_id, **kwargs)
+
+
+async def _run_level(client: httpx.AsyncClient, concurrency: int, rounds: int) -> float:
+    async def worker(worker_id: int) -> None:
+        for i in range(rounds):
+            r = await client.post("/api/chat", json={
+                "message": f"how was your day {i}",
+                "mode": ChatMode.WELLNESS.value,
+                "session_id": f"bench-{worker_id}",
+            })
+            r.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return (concurrency * rounds) / elapsed
+
+
+async def main(latency: float, rounds: int, levels: list[int]) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    _FakeModel.latency = latency
+    settings.google_ai_api_key = settings.google_ai_api_key or "benchmark"
+    transport = httpx.ASGITransport(app=app)
+
+    with mock.patch.object(chat_service.genai, "GenerativeModel", _FakeModel):
+        for scenario in ("blocking", "async"):
+            patches = []
+            if scenario == "blocking":
+                patches.append(mock.patch.object(
+                    ChatService, "get_contextual_response_async", classmethod(_blocking_response)
+                ))
+            for p in patches:
+                p.start()
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                    print(f"\n=== {scenario} (simulated Gemini latency {latency * 1000:.0f} ms) ===")
+                    print(f"{'concurrency':>12} {'req/s':>10}")
+                    for level in levels:
+                        rps = await _run_level(client, level, rounds)
+                        print(f"{level:>12} {rps:>10.1f}")
+            finally:
+                for p in patches:
+                    p.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated Gemini latency in seconds")
+    parser.add_argument("--rounds", type=int, default=3, help="Requests per concurrent client")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.rounds, args.levels))
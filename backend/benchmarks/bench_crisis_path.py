@@ -0,0 +1,83 @@
+"""
+Crisis path latency SLO check.
+
+Sends crisis messages to every endpoint that short-circuits to a crisis
+reply (chat, playbook, wellness suggestions/checklist/check-in) in-process,
+and reports p50/p99 latency per endpoint. Exits non-zero if any endpoint's
+p99 exceeds the SLO. Also reports what building the crisis payloads costs,
+which every crisis request paid before they were precomputed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_crisis_path --requests 500 --slo-ms 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+from app.main import app
+from app.services.crisis_bundle import build_crisis_bundle, init_crisis_bundle
+from app.services.resource_service import init_resource_service
+from app.services.safety import get_safety_engine
+
+CRISIS_MESSAGE = "I don't want to live anymore"
+
+ENDPOINTS = [
+    ("/api/chat", {"message": CRISIS_MESSAGE, "mode": "wellness"}),
+    ("/api/playbooks/run", {"message": CRISIS_MESSAGE}),
+    ("/api/wellness/suggestions", {"mood": "struggling", "note": CRISIS_MESSAGE}),
+    ("/api/wellness/checklist", {"mood": "struggling", "note": CRISIS_MESSAGE}),
+    ("/api/wellness/checkin", {"mood": "struggling", "note": CRISIS_MESSAGE}),
+]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def main(requests: int, slo_ms: float) -> int:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # ASGITransport does not run startup events; do the same setup by hand
+    json_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "uvic_student_resources.json")
+    init_resource_service(os.path.abspath(json_path))
+    init_crisis_bundle()
+    get_safety_engine()
+
+    start = time.perf_counter()
+    for _ in range(100):
+        build_crisis_bundle()
+    build_ms = (time.perf_counter() - start) * 10
+    print(f"building crisis payloads: {build_ms:.3f} ms (per request before precomputing)")
+
+    violations = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n{'endpoint':<28} {'p50 ms':>8} {'p99 ms':>8}  (SLO p99 <= {slo_ms} ms)")
+        for path, payload in ENDPOINTS:
+            samples = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.post(path, json=payload)
+                samples.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+            p50, p99 = statistics.median(samples), _percentile(samples, 0.99)
+            status = "ok" if p99 <= slo_ms else "SLO MISSED"
+            violations += p99 > slo_ms
+            print(f"{path:<28} {p50:>8.3f} {p99:>8.3f}  {status}")
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--slo-ms", type=float, default=10.0, help="p99 latency budget per request")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.requests, args.slo_ms)))
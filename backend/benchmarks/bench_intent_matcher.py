@@ -0,0 +1,189 @@
+"""
+IntentMatcher benchmark.
+
+Times `match_intent` on the bundled dataset and on a synthetic 100k-pattern
+dataset, against a linear scan that scores every pattern (the pre-index
+algorithm), plus the vectorized `match_intents_batch` throughput. Also
+checks typo correction: correctly spelled real words ("sick", "tired") must
+score exactly as without correction, and common misspellings must still be
+fixed. Exits non-zero if either check fails.
+
+Usage (from backend/):
+    python -m benchmarks.bench_intent_matcher --synthetic-patterns 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from app.services.intent_matcher import (
+    CRISIS_BOOST,
+    CRISIS_TAGS,
+    CRITICAL_KEYWORDS,
+    EMOTIONAL_BOOST,
+    IntentMatcher,
+    normalize_text,
+)
+
+SAMPLE_MESSAGES = [
+    "hi there",
+    "i'm so stressed about my exams this week",
+    "I feel really lonely since moving here",
+    "can't sleep again, my mind keeps racing",
+    "my boyfriend and I keep fighting",
+    "thanks, that actually helped",
+    "i don't know what to do anymore",
+    "feeling anxious about my presentation tomorrow",
+]
+
+# Correctly spelled messages whose words may be missing from the dataset
+# vocabulary; typo correction must leave their scores untouched
+CORRECTLY_SPELLED_MESSAGES = [
+    "i feel sick",
+    "so tired lately",
+    "i am sick and tired of this",
+    "my throat is sore",
+    "i'm bored and hungry",
+    "i feel so alone and numb",
+    "i tried talking to my mom",
+    "work has been rough this week",
+    "I need to fill out a form",
+    "my boyfriend lied to me",
+    "I keep putting off my homework",
+    "it's so quiet in my dorm",
+    "the depth of the lake",
+    "we toured the old mill and the kiln",
+    "turn the page",
+    "there are three of us in the house",
+]
+
+# Misspelling -> the word it must be corrected to
+EXPECTED_CORRECTIONS = {
+    "anxeity": "anxiety",
+    "overwhlemed": "overwhelmed",
+    "stresed": "stressed",
+    "lonley": "lonely",
+    "depresed": "depressed",
+    "hopeles": "hopeless",
+    "freinds": "friends",
+    "exmas": "exams",
+    "suicidel": "suicidal",
+    "scaredd": "scared",
+    "becuase": "because",
+    "overwelmed": "overwhelmed",
+}
+
+
+def linear_match(matcher: IntentMatcher, message: str, threshold: float = 0.5):
+    """Reference scan over every pattern, as before the index existed."""
+    normalized_input = matcher._normalize_text(message)
+    best_tag, best_score = None, 0.0
+    for intent in matcher.intents:
+        tag = intent.get("tag", "")
+        if not intent.get("patterns") or not intent.get("responses"):
+            continue
+        for pattern in intent["patterns"]:
+            score = matcher._calculate_similarity(message, pattern)
+            if tag in CRITICAL_KEYWORDS and any(k in normalized_input for k in CRITICAL_KEYWORDS[tag]):
+                score = max(score, CRISIS_BOOST if tag in CRISIS_TAGS else EMOTIONAL_BOOST)
+            if score > best_score:
+                best_tag, best_score = tag, score
+    return (best_tag, best_score) if best_score >= threshold else None
+
+
+def synthetic_intents(total_patterns: int, seed: int = 7) -> list[dict]:
+    """Generate intents whose patterns reuse the real dataset's vocabulary."""
+    rng = random.Random(seed)
+    vocabulary = sorted({
+        word
+        for intent in IntentMatcher().intents
+        for pattern in intent.get("patterns", [])
+        for word in pattern.lower().split()
+    })
+    patterns_per_intent = 20
+    intents = []
+    for n in range(max(1, total_patterns // patterns_per_intent)):
+        intents.append({
+            "tag": f"synthetic-{n}",
+            "patterns": [
+                " ".join(rng.choices(vocabulary, k=rng.randint(2, 8)))
+                for _ in range(patterns_per_intent)
+            ],
+            "responses": [f"response {n}"],
+        })
+    return intents
+
+
+def _time_per_call(fn, messages: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            fn(message)
+    return (time.perf_counter() - start) / (repeat * len(messages))
+
+
+def run(label: str, matcher: IntentMatcher, repeat: int, linear_repeat: int) -> None:
+    indexed = _time_per_call(matcher.match_intent, SAMPLE_MESSAGES, repeat)
+    linear = _time_per_call(lambda m: linear_match(matcher, m), SAMPLE_MESSAGES, linear_repeat)
+    patterns = sum(len(i.get("patterns", [])) for i in matcher.intents)
+    print(f"\n=== {label} ({patterns} patterns) ===")
+    print(f"{'indexed':>10}: {indexed * 1000:9.3f} ms/msg")
+    print(f"{'linear':>10}: {linear * 1000:9.3f} ms/msg  ({linear / indexed:.1f}x slower)")
+
+    batch = SAMPLE_MESSAGES * 250
+    matcher.match_intents_batch(batch[:1])  # build the TF-IDF model outside the timing
+    start = time.perf_counter()
+    matcher.match_intents_batch(batch, top_k=3)
+    elapsed = time.perf_counter() - start
+    print(f"{'batch':>10}: {elapsed / len(batch) * 1000:9.3f} ms/msg  ({len(batch)} messages, TF-IDF top-3)")
+
+
+def check_typo_correction(matcher: IntentMatcher, repeat: int) -> bool:
+    """Parity on correctly spelled messages, recall on misspellings, and timing."""
+    index = matcher._index
+    ok = True
+    print("\n=== typo correction ===")
+    for message in CORRECTLY_SPELLED_MESSAGES:
+        plain = matcher._score_intents(index, normalize_text(message))
+        corrected = matcher._score_with_typo_correction(index, message)
+        if plain != corrected:
+            ok = False
+            rewritten = index.typo_index.correct_text(normalize_text(message))
+            print(f"FAIL: {message!r} scores changed (corrected to {rewritten!r})")
+    for typo, expected in EXPECTED_CORRECTIONS.items():
+        actual = index.typo_index.correct_word(typo)
+        if actual != expected:
+            ok = False
+            print(f"FAIL: {typo!r} corrected to {actual!r}, expected {expected!r}")
+
+    messages = SAMPLE_MESSAGES + CORRECTLY_SPELLED_MESSAGES + [f"so {typo} lately" for typo in EXPECTED_CORRECTIONS]
+    plain = _time_per_call(lambda m: matcher._score_intents(index, normalize_text(m)), messages, repeat)
+    corrected = _time_per_call(lambda m: matcher._score_with_typo_correction(index, m), messages, repeat)
+    print(f"{'plain':>10}: {plain * 1000:9.3f} ms/msg")
+    print(f"{'corrected':>10}: {corrected * 1000:9.3f} ms/msg  (+{(corrected - plain) * 1000:.3f} ms for correction)")
+    print("typo correction: " + ("ok" if ok else "FAILED"))
+    return ok
+
+
+def main(synthetic_patterns: int, repeat: int) -> int:
+    start = time.perf_counter()
+    matcher = IntentMatcher()
+    print(f"dataset index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    run("bundled dataset", matcher, repeat, linear_repeat=max(1, repeat // 10))
+    typo_ok = check_typo_correction(matcher, repeat)
+
+    intents = synthetic_intents(synthetic_patterns)
+    start = time.perf_counter()
+    synthetic = IntentMatcher(intents=intents)
+    print(f"\nsynthetic index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    run("synthetic dataset", synthetic, max(1, repeat // 10), linear_repeat=1)
+    return 0 if typo_ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic-patterns", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    sys.exit(main(args.synthetic_patterns, args.repeat))
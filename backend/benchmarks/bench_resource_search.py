@@ -0,0 +1,144 @@
+"""
+ResourceService.search benchmark.
+
+Times indexed `search` against the previous linear scan (lowercasing every
+field of every resource per query) on the bundled catalogue and on a
+synthetic catalogue, and checks that both return identical results. Also
+times the semantic (character n-gram TF-IDF) mode. The result cache is
+disabled so every query is ranked.
+
+Usage (from backend/):
+    python -m benchmarks.bench_resource_search --synthetic-resources 100000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from app.services.resource_service import ResourceCard, ResourceIndex, ResourceSearchMode, ResourceService
+
+DATA_PATH = Path(__file__).resolve().parents[2] / "data" / "uvic_student_resources.json"
+
+SAMPLE_QUERIES = [
+    "Student Wellness Centre",
+    "UVic Counselling",
+    "Academic Skills Centre",
+    "counsel",
+    "library",
+    "clubs",
+    "CARSA",
+    "health",
+    "international",
+    "no such resource anywhere",
+    "a",
+]
+
+# Free text the substring scorer finds nothing for
+SEMANTIC_QUERIES = [
+    "i need someone to talk to",
+    "where can i get food",
+    "i can't afford rent",
+    "conselling",
+]
+
+
+def linear_search(service: ResourceService, query: str, limit: int = 5) -> list[dict]:
+    """Reference scan, as before the index existed."""
+    if not query or not query.strip():
+        return []
+    query_lower = query.strip().lower()
+    scored = []
+    for resource in service._index.resources:
+        score = 0
+        if query_lower in resource.name.lower():
+            score += 3
+        if query_lower in resource.description.lower():
+            score += 2
+        for category in resource.categories:
+            if query_lower in category.lower():
+                score += 1
+                break
+        if resource.location and query_lower in resource.location.lower():
+            score += 1
+        if score > 0:
+            scored.append((score, resource.name, resource))
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [resource.to_dict() for _, _, resource in scored[:limit]]
+
+
+def synthetic_service(total: int, seed: int = 11) -> ResourceService:
+    """Catalogue whose fields reuse the bundled catalogue's words."""
+    rng = random.Random(seed)
+    items = json.loads(DATA_PATH.read_text(encoding="utf-8"))["resources"]
+    words = sorted({word for item in items for word in f"{item['name']} {item.get('description', '')}".split()})
+    categories = sorted({category for item in items for category in item.get("categories", [])})
+    locations = sorted({item["location"] for item in items if item.get("location")})
+
+    service = ResourceService(cache_size=0)
+    resources = [
+        ResourceCard(
+            name=" ".join(rng.choices(words, k=rng.randint(2, 5))),
+            description=" ".join(rng.choices(words, k=rng.randint(8, 30))),
+            categories=rng.sample(categories, k=rng.randint(1, 3)),
+            url=f"/synthetic/{n}",
+            location=rng.choice(locations) if rng.random() < 0.5 else None,
+            resource_id=f"synthetic-{n}",
+        )
+        for n in range(total)
+    ]
+    service._index = ResourceIndex(resources, version="synthetic")
+    service._loaded = True
+    return service
+
+
+def _time_per_query(fn, queries: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def run(label: str, service: ResourceService, repeat: int) -> int:
+    mismatches = [q for q in SAMPLE_QUERIES if service.search(q)[0] != linear_search(service, q)]
+    for query in mismatches:
+        print(f"  MISMATCH for {query!r}")
+
+    indexed = _time_per_query(service.search, SAMPLE_QUERIES, repeat)
+    linear = _time_per_query(lambda q: linear_search(service, q), SAMPLE_QUERIES, max(1, repeat // 10))
+    print(f"\n=== {label} ({len(service._index.resources)} resources) ===")
+    print(f"{'indexed':>10}: {indexed * 1000:9.3f} ms/query")
+    print(f"{'linear':>10}: {linear * 1000:9.3f} ms/query  ({linear / indexed:.1f}x slower)")
+    for query in ("counsel", "no such resource anywhere"):
+        per_query = _time_per_query(service.search, [query], repeat)
+        candidates = len(service._index.candidates(query.lower()))
+        print(f"{query!r:>30}: {per_query * 1000:9.3f} ms  ({candidates} candidates scored)")
+    service._index.semantic_model()  # build the n-gram model outside the timing
+    semantic = _time_per_query(
+        lambda q: service.search(q, mode=ResourceSearchMode.SEMANTIC), SEMANTIC_QUERIES, repeat
+    )
+    print(f"{'semantic':>10}: {semantic * 1000:9.3f} ms/query")
+    return len(mismatches)
+
+
+def main(synthetic_resources: int, repeat: int) -> int:
+    service = ResourceService(cache_size=0)
+    service.load_resources(DATA_PATH)
+    failures = run("bundled catalogue", service, repeat)
+
+    start = time.perf_counter()
+    synthetic = synthetic_service(synthetic_resources)
+    print(f"\nsynthetic catalogue + index built in {(time.perf_counter() - start):.2f} s")
+    failures += run("synthetic catalogue", synthetic, max(1, repeat // 10))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic-resources", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(main(args.synthetic_resources, args.repeat))
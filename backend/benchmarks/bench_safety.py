@@ -0,0 +1,165 @@
+"""
+Crisis detection benchmark and accuracy check.
+
+Times `SafetyEngine.detect` against the previous detector (one `re.search`
+per phrase over the lowercased text) and scores both on
+benchmarks/safety_corpus.json: crisis messages, including obfuscated ones,
+and safe messages that share words with crisis phrases. Exits non-zero if
+the engine misses a crisis message, reports a wrong category, or flags a
+safe one.
+
+Also times `StreamingSafetyScanner.feed` per chunk for replies of growing
+length, which should stay flat, and `detect` on long adversarial inputs
+("s s s ...", "s.s.s.s..."), which must stay linear in the input length
+(exits non-zero if a case grows much faster or exceeds its time budget).
+
+Usage (from backend/):
+    python -m benchmarks.bench_safety --repeat 2000
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from app.models.schemas import MAX_MESSAGE_LENGTH
+from app.services.safety import SafetyEngine, StreamingSafetyScanner
+
+CORPUS_PATH = Path(__file__).with_name("safety_corpus.json")
+
+# Repeated units that made an unbounded crisis pattern backtrack
+ADVERSARIAL_UNITS = ["s s ", "s.s.s.s.", "k i l l ", "suuuuuuuuuu", "my self ", "kill" + " " * 40, "end. it "]
+
+# Per-character cost may grow at most this much from 1x to 8x the message limit
+MAX_GROWTH = 3.0
+# A maximum-length message must be scanned within this budget
+MAX_MESSAGE_MS = 50.0
+
+# The detector before SafetyEngine, kept verbatim for comparison
+LEGACY_PATTERNS = [
+    r"\bsuicide\b",
+    r"\bsuicidal\b",
+    r"\bkill myself\b",
+    r"\bend my life\b",
+    r"\bwant to die\b",
+    r"\bdon't want to live\b",
+    r"\bdo not want to live\b",
+    r"\bdont want to live\b",
+    r"\bself[- ]?harm\b",
+    r"\bhurt myself\b",
+    r"\bcut myself\b",
+    r"\boverdose\b",
+    r"\bend it all\b",
+    r"\bending it all\b",
+    r"\btake my life\b",
+    r"\bwish i was dead\b",
+    r"\bcan't go on\b",
+    r"\bcant go on\b",
+    r"\bno reason to live\b",
+]
+
+
+def legacy_detect(text: str) -> bool:
+    lower = text.lower()
+    return any(re.search(pattern, lower) for pattern in LEGACY_PATTERNS)
+
+
+def _time_per_call(fn, messages: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            fn(message)
+    return (time.perf_counter() - start) / (repeat * len(messages))
+
+
+def check_accuracy(engine: SafetyEngine, corpus: dict) -> int:
+    """Print recall / false positives for both detectors; return engine failures."""
+    crisis, safe = corpus["crisis"], corpus["safe"]
+    failures = 0
+    for case in crisis:
+        categories = sorted({match.category for match in engine.scan(case["text"])})
+        if categories != sorted(case["categories"]):
+            failures += 1
+            print(f"  MISS  {case['text']!r}: got {categories}, expected {sorted(case['categories'])}")
+    for text in safe:
+        if engine.detect(text):
+            failures += 1
+            print(f"  FALSE POSITIVE  {text!r}: {[m.phrase for m in engine.scan(text)]}")
+
+    for label, detect in (("legacy", legacy_detect), ("engine", engine.detect)):
+        caught = sum(detect(case["text"]) for case in crisis)
+        flagged = sum(detect(text) for text in safe)
+        print(f"{label:>10}: recall {caught}/{len(crisis)}, false positives {flagged}/{len(safe)}")
+    return failures
+
+
+def time_streaming(chunk_size: int = 24) -> None:
+    """Per-chunk scanner cost for replies of increasing length."""
+    sentence = "That sounds like a lot to carry. Want to try a short walk around Ring Road? "
+    print(f"\n=== streaming scanner ({chunk_size}-char chunks) ===")
+    for reply_chars in (500, 5_000, 50_000):
+        reply = (sentence * (reply_chars // len(sentence) + 1))[:reply_chars]
+        chunks = [reply[i:i + chunk_size] for i in range(0, len(reply), chunk_size)]
+        scanner = StreamingSafetyScanner(require_crisis_resources=True)
+        start = time.perf_counter()
+        for chunk in chunks:
+            scanner.feed(chunk)
+        scanner.finish()
+        elapsed = time.perf_counter() - start
+        print(f"{reply_chars:>8} chars: {elapsed / len(chunks) * 1e6:6.2f} us/chunk")
+
+
+def time_long_inputs(engine: SafetyEngine) -> int:
+    """`detect` on long repetitive inputs; return the cases that are not linear or too slow."""
+    print(f"\n=== long inputs (limit {MAX_MESSAGE_LENGTH} chars) ===")
+    failures = 0
+    for unit in ADVERSARIAL_UNITS:
+        timings = []
+        for length in (MAX_MESSAGE_LENGTH, 8 * MAX_MESSAGE_LENGTH):
+            text = (unit * (length // len(unit) + 1))[:length]
+            start = time.perf_counter()
+            engine.detect(text)
+            timings.append(time.perf_counter() - start)
+        at_limit, at_8x = timings
+        growth = (at_8x / 8) / max(at_limit, 1e-9)
+        ok = growth <= MAX_GROWTH and at_limit * 1000 <= MAX_MESSAGE_MS
+        failures += not ok
+        print(
+            f"{unit!r:>16}: {at_limit * 1000:7.2f} ms at limit, {at_8x * 1000:8.2f} ms at 8x"
+            f"  (per-char growth {growth:.1f}x){'' if ok else '  FAIL'}"
+        )
+    return failures
+
+
+def main(repeat: int) -> int:
+    corpus = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    start = time.perf_counter()
+    engine = SafetyEngine()
+    print(f"engine compiled in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    failures = check_accuracy(engine, corpus)
+
+    messages = [case["text"] for case in corpus["crisis"]] + corpus["safe"]
+    safe = corpus["safe"]
+    for label, sample in (("all", messages), ("safe only", safe)):
+        legacy = _time_per_call(legacy_detect, sample, repeat)
+        compiled = _time_per_call(engine.detect, sample, repeat)
+        print(f"\n=== {label} ({len(sample)} messages) ===")
+        print(f"{'legacy':>10}: {legacy * 1e6:8.2f} us/msg")
+        print(f"{'engine':>10}: {compiled * 1e6:8.2f} us/msg  ({legacy / compiled:.1f}x)")
+
+    time_streaming()
+    failures += time_long_inputs(engine)
+
+    if failures:
+        print(f"\n{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    sys.exit(main(args.repeat))